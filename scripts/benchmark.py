@@ -0,0 +1,334 @@
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from generate_techgear_data import (
+    DEFAULT_CHUNK_SIZE, generate_product_catalog, generate_customer_base, iter_sales_transactions,
+    init_customer_totals, accumulate_customer_totals, apply_customer_totals, transaction_categories
+)
+from techgear_model import compact_table, write_compact_table
+from data_validation import validate_techgear_data
+from load_sqlite import load_techgear_database
+from parallel_sql_runner import load_statements
+from query_cache import DASHBOARD_SQL_FILES
+from hll import register_sqlite_functions
+
+# Offline performance benchmark for the TechGear Plus pipeline.
+#
+# For each dataset size the pipeline runs end to end on freshly generated
+# data: generation, CSV write, validation, SQLite load and every named
+# statement in the dashboard SQL files. Each step group runs in its own
+# spawned process, so the peak RSS reported for a stage is that process's
+# high-water mark rather than whatever earlier stages left behind. The
+# whole pass is repeated (--repeat) and a stage's fastest run is what gets
+# reported and compared, since slower runs only add scheduler and cache noise.
+# Generation uses the generator's streaming path with its default seed and
+# chunk size - the same data as generate_techgear_data.py --stream.
+
+BENCHMARK_SIZES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+    '10m': 10_000_000
+}
+
+BENCHMARK_DATA_DIR = '../data/benchmark'
+RESULTS_PATH = '../data/processed/benchmark_results.json'
+BASELINE_PATH = '../data/processed/benchmark_baseline.json'
+
+# A stage regresses when it is this much slower (or larger) than the baseline
+DEFAULT_THRESHOLD = 0.25
+# Stages faster than this are too noisy to compare
+MIN_COMPARABLE_SECONDS = 0.25
+# Runs of each step group; the fastest counts
+DEFAULT_REPEATS = 3
+# Compared stages needed before times are judged against their median shift
+MIN_DRIFT_STAGES = 3
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _stage(seconds, rows):
+    return {'seconds': seconds, 'rows': rows, 'rows_per_sec': rows / seconds if seconds else 0.0}
+
+def bench_generation(raw_dir, transactions, seed=42, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Generate and write a dataset, timing generation and CSV writing separately"""
+    np.random.seed(seed)
+    random.seed(seed)
+    os.makedirs(raw_dir, exist_ok=True)
+    generate_seconds = 0.0
+    write_seconds = 0.0
+
+    start = time.perf_counter()
+    products_df = compact_table(generate_product_catalog(), 'techgear_products')
+    customers_df = compact_table(generate_customer_base(), 'techgear_customers')
+    categories = transaction_categories(products_df)
+    totals = init_customer_totals(customers_df)
+    chunks = iter_sales_transactions(products_df, customers_df, transactions, chunk_size)
+    generate_seconds += time.perf_counter() - start
+
+    chunk_number = 0
+    while True:
+        start = time.perf_counter()
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        accumulate_customer_totals(totals, chunk)
+        generate_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_compact_table(chunk, 'techgear_transactions', raw_dir, append=chunk_number > 0,
+                            categories=categories)
+        write_seconds += time.perf_counter() - start
+        chunk_number += 1
+
+    start = time.perf_counter()
+    customers_df = apply_customer_totals(customers_df, totals)
+    generate_seconds += time.perf_counter() - start
+
+    start = time.perf_counter()
+    write_compact_table(products_df, 'techgear_products', raw_dir)
+    write_compact_table(customers_df, 'techgear_customers', raw_dir)
+    write_seconds += time.perf_counter() - start
+
+    return {
+        'generation': _stage(generate_seconds, transactions),
+        'csv_write': _stage(write_seconds, transactions)
+    }
+
+def bench_validation(raw_dir, transactions):
+    """Run the validator over the dataset (its report is discarded)"""
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()) as report:
+        results = validate_techgear_data(raw_dir=raw_dir)
+    if results is None:
+        raise RuntimeError(f"Validation failed:\n{report.getvalue()}")
+    return {'validation': _stage(time.perf_counter() - start, transactions)}
+
+def bench_load(raw_dir, db_path, transactions):
+    """Build the SQLite database from the dataset
+
+    The bulk load (tables, indexes, ANALYZE) and the rollup/sketch build are
+    reported as separate stages.
+    """
+    stats = load_techgear_database(db_path, raw_dir)
+    return {
+        'sqlite_load': _stage(stats['load']['seconds'], transactions),
+        'rollup_build': _stage(stats['rollups']['seconds'], transactions)
+    }
+
+def bench_queries(db_path, transactions, files=DASHBOARD_SQL_FILES):
+    """Time every named dashboard statement once on a fresh connection"""
+    conn = register_sqlite_functions(sqlite3.connect(f'file:{db_path}?mode=ro', uri=True))
+    stages = {}
+    try:
+        for file_name, name, sql in load_statements(files):
+            start = time.perf_counter()
+            conn.execute(sql).fetchall()
+            stages[f'query:{file_name}:{name}'] = _stage(time.perf_counter() - start, transactions)
+    finally:
+        conn.close()
+    return stages
+
+def _measured(stage_function, *args):
+    """Run a stage in the current (worker) process and attach its peak RSS"""
+    stages = stage_function(*args)
+    rss = peak_rss_mb()
+    for stats in stages.values():
+        stats['peak_rss_mb'] = rss
+    return stages
+
+def run_isolated(stage_function, *args):
+    """Run a stage function in a fresh spawned process and return its timings"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_measured, stage_function, *args).result()
+
+def best_of(runs):
+    """Merge repeated runs of a step group into one entry per stage
+
+    'seconds' (and rows_per_sec) come from the fastest run; the median time
+    and the median peak RSS are kept alongside.
+    """
+    stages = {}
+    for stage in runs[0]:
+        seconds = [run[stage]['seconds'] for run in runs]
+        stats = _stage(min(seconds), runs[0][stage]['rows'])
+        stats['median_seconds'] = float(np.median(seconds))
+        stats['peak_rss_mb'] = float(np.median([run[stage]['peak_rss_mb'] for run in runs]))
+        stats['runs'] = len(runs)
+        stages[stage] = stats
+    return stages
+
+def run_size(label, transactions, data_dir=BENCHMARK_DATA_DIR, keep_data=False, repeats=DEFAULT_REPEATS):
+    """Benchmark every stage for one dataset size, running each step group repeats times"""
+    raw_dir = os.path.join(data_dir, label)
+    db_path = os.path.join(data_dir, f'{label}.db')
+
+    # Whole passes are repeated rather than each group back to back, so a
+    # slow spell on the machine hits one run of a stage instead of all of them
+    groups = [
+        (bench_generation, (raw_dir, transactions)),
+        (bench_validation, (raw_dir, transactions)),
+        (bench_load, (raw_dir, db_path, transactions)),
+        (bench_queries, (db_path, transactions))
+    ]
+    runs = [[] for _ in groups]
+    stages = {}
+    try:
+        for _ in range(repeats):
+            # Each pass generates a fresh dataset
+            shutil.rmtree(raw_dir, ignore_errors=True)
+            for group_runs, (stage_function, args) in zip(runs, groups):
+                group_runs.append(run_isolated(stage_function, *args))
+        for group_runs in runs:
+            stages.update(best_of(group_runs))
+    finally:
+        if not keep_data:
+            shutil.rmtree(raw_dir, ignore_errors=True)
+            if os.path.exists(db_path):
+                os.remove(db_path)
+    return {'transactions': transactions, 'stages': stages}
+
+def environment_info():
+    """Interpreter and library versions recorded with the results"""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+def compare_results(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Stages slower or larger than the baseline by more than threshold
+
+    Compares the fastest-run times. Only sizes and stages present in both
+    runs are compared; stages faster than MIN_COMPARABLE_SECONDS in the
+    baseline are skipped as noise. When at least MIN_DRIFT_STAGES stages are
+    compared, time ratios are taken relative to their median, so a machine
+    that is uniformly slower than when the baseline was recorded does not
+    flag every stage. Returns (regressions, {size: median time ratio}).
+    """
+    regressions = []
+    drift = {}
+    for label, entry in results['sizes'].items():
+        baseline_stages = baseline.get('sizes', {}).get(label, {}).get('stages', {})
+        compared = {
+            stage: (stats, baseline_stages[stage]) for stage, stats in entry['stages'].items()
+            if stage in baseline_stages and baseline_stages[stage]['seconds'] >= MIN_COMPARABLE_SECONDS
+        }
+        if not compared:
+            continue
+        drift[label] = float(np.median([stats['seconds'] / base['seconds'] for stats, base in compared.values()]))
+        scale = {'seconds': drift[label] if len(compared) >= MIN_DRIFT_STAGES else 1.0, 'peak_rss_mb': 1.0}
+        for stage, (stats, base) in compared.items():
+            for metric in ('seconds', 'peak_rss_mb'):
+                ratio = stats[metric] / base[metric] if base[metric] else 1.0
+                if ratio / scale[metric] > 1 + threshold:
+                    regressions.append({
+                        'size': label, 'stage': stage, 'metric': metric,
+                        'baseline': base[metric], 'current': stats[metric], 'ratio': ratio
+                    })
+    return regressions, drift
+
+def write_json(payload, path):
+    """Write a JSON file atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'w') as json_file:
+        json.dump(payload, json_file, indent=2)
+    os.replace(path + '.tmp', path)
+
+def print_size_report(label, entry, baseline_entry=None):
+    """One line per stage: best and median time, throughput, peak RSS and change vs baseline"""
+    print(f"\n{label} ({entry['transactions']:,} transactions):")
+    baseline_stages = (baseline_entry or {}).get('stages', {})
+    for stage, stats in entry['stages'].items():
+        base = baseline_stages.get(stage)
+        change = f"{(stats['seconds'] / base['seconds'] - 1) * 100:+6.1f}%" if base and base['seconds'] else ''
+        median = f"{stats['median_seconds']:.3f}s" if 'median_seconds' in stats else ''
+        print(f"  {stats['seconds']:9.3f}s  {median:>9}  {stats['rows_per_sec']:>14,.0f} rows/s  "
+              f"{stats['peak_rss_mb']:7.0f} MB  {change:>7}  {stage}")
+
+def main():
+    """Benchmark the pipeline at several dataset sizes and check for regressions"""
+    parser = argparse.ArgumentParser(description="Benchmark the TechGear Plus data pipeline")
+    parser.add_argument('--sizes', nargs='+', choices=list(BENCHMARK_SIZES), default=list(BENCHMARK_SIZES),
+                        help="dataset sizes to benchmark")
+    parser.add_argument('--data-dir', default=BENCHMARK_DATA_DIR, help="scratch directory for datasets")
+    parser.add_argument('--output', default=RESULTS_PATH, help="results JSON path")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a stage counts as a regression (0.25 = 25%%)")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--keep-data', action='store_true', help="keep the generated datasets and databases")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEATS,
+                        help="runs of each step group; the fastest is reported and compared")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    print("Benchmarking TechGear Plus pipeline...")
+    print("=" * 50)
+
+    results = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'sizes': {}
+    }
+    for label in args.sizes:
+        entry = run_size(label, BENCHMARK_SIZES[label], args.data_dir, args.keep_data, args.repeat)
+        results['sizes'][label] = entry
+        print_size_report(label, entry, (baseline or {}).get('sizes', {}).get(label))
+        # Keep partial results if a larger size fails later
+        write_json(results, args.output)
+
+    print(f"\n✓ Results written to {args.output}")
+    if args.save_baseline:
+        write_json(results, args.baseline)
+        print(f"✓ Baseline saved to {args.baseline}")
+        return
+    if baseline is None:
+        print(f"  No baseline at {args.baseline} (run with --save-baseline to create one)")
+        return
+
+    regressions, drift = compare_results(results, baseline, args.threshold)
+    for label, ratio in drift.items():
+        if abs(ratio - 1) > args.threshold:
+            print(f"  {label}: stages ran {ratio:.2f}x their baseline times overall "
+                  f"(machine load or environment change; judged relative to that)")
+    if not regressions:
+        print(f"✓ No regressions beyond {args.threshold:.0%} of the baseline")
+        return
+    print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%} of the baseline:")
+    for regression in regressions:
+        print(f"  {regression['size']} {regression['stage']} {regression['metric']}: "
+              f"{regression['baseline']:.3f} -> {regression['current']:.3f} ({regression['ratio']:.2f}x)")
+    sys.exit(1)
+
+if __name__ == "__main__":
+    main()
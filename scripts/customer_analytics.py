@@ -0,0 +1,277 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from techgear_io import RAW_DATA_DIR, read_table, format_id_column
+from techgear_model import money_cents
+
+# Cohort retention and RFM segmentation over every transaction.
+#
+# customer_analysis.sql reads the precomputed total_spent per customer; here
+# the metrics come straight from techgear_transactions. Customers are joined
+# through a lookup array indexed by the integer customer key, so each
+# transaction maps to its customer row without a merge. Per-customer and
+# per-(cohort, month) figures are np.bincount passes over int64 keys, plus one
+# sort to find distinct (customer, month) pairs - no per-customer Python loops
+# and no SQL self-joins.
+#
+# Cohorts are registration months. The generator does not tie order dates to
+# registration, so orders placed before a customer's registration month are
+# counted separately (pre_cohort_orders) and left out of the matrix.
+
+PROCESSED_DATA_DIR = '../data/processed'
+
+OUTPUT_FILES = {
+    'cohort_retention': 'cohort_retention.csv',
+    'cohort_matrix': 'cohort_retention_matrix.csv',
+    'customer_rfm': 'customer_rfm.csv',
+    'rfm_segments': 'rfm_segments.csv'
+}
+
+# Quintile edges for the 1-5 R, F and M scores
+SCORE_QUANTILES = [0.2, 0.4, 0.6, 0.8]
+
+# RFM segments, first match wins (r/f are the 1-5 recency and frequency scores)
+RFM_SEGMENTS = [
+    ('Champions', lambda r, f: (r >= 4) & (f >= 4)),
+    ('Loyal Customers', lambda r, f: (r >= 3) & (f >= 4)),
+    ('Potential Loyalists', lambda r, f: (r >= 4) & (f >= 2)),
+    ('New Customers', lambda r, f: r >= 4),
+    ('Needs Attention', lambda r, f: r == 3),
+    ('At Risk', lambda r, f: f >= 3),
+    ('Hibernating', lambda r, f: r <= 2)
+]
+
+def _day_numbers(values):
+    """Dates as int64 days since the epoch"""
+    return np.asarray(values).astype('datetime64[D]').astype(np.int64)
+
+def _month_numbers(days):
+    """int64 day numbers to int64 months since the epoch"""
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+def _sorted_unique(keys):
+    """Distinct int64 keys via sort + adjacent compare (cheaper than np.unique)"""
+    keys = np.sort(keys)
+    first = np.empty(len(keys), dtype=bool)
+    first[:1] = True
+    np.not_equal(keys[1:], keys[:-1], out=first[1:])
+    return keys[first]
+
+def _month_label(month):
+    return str(np.datetime64(int(month), 'M'))
+
+def customer_rows(customer_keys, transaction_keys):
+    """Row in the customers table for each transaction (-1 if unknown)"""
+    size = max(customer_keys.max(initial=-1), transaction_keys.max(initial=-1)) + 1
+    lookup = np.full(size, -1, dtype=np.int64)
+    lookup[customer_keys] = np.arange(len(customer_keys))
+    return lookup[transaction_keys]
+
+def load_activity(raw_dir=RAW_DATA_DIR, start_date=None, end_date=None):
+    """Integer arrays for the analytics: customer keys/registration days, and
+    per transaction the customer row, order day and amount in cents"""
+    customers = read_table('techgear_customers', raw_dir, ['customer_id', 'registration_date'], decode_ids=False)
+    transactions = read_table('techgear_transactions', raw_dir, ['customer_id', 'order_date', 'total_amount'],
+                              decode_ids=False, start_date=start_date, end_date=end_date)
+    customer_keys = customers['customer_id'].to_numpy(dtype=np.int64)
+    return {
+        'customer_keys': customer_keys,
+        'registration_days': _day_numbers(customers['registration_date']),
+        'rows': customer_rows(customer_keys, transactions['customer_id'].to_numpy(dtype=np.int64)),
+        'order_days': _day_numbers(transactions['order_date']),
+        'amount_cents': money_cents(transactions['total_amount'])
+    }
+
+def cohort_retention(activity):
+    """Monthly cohort retention in long form
+
+    One row per (cohort_month, months_since_registration) that the data can
+    observe: cohort size, customers with at least one order that month,
+    retention rate, orders and revenue. Returns (frame, pre_cohort_orders).
+    """
+    cohort_of_customer = _month_numbers(activity['registration_days'])
+    first_cohort = cohort_of_customer.min()
+    num_cohorts = cohort_of_customer.max() - first_cohort + 1
+    cohort_sizes = np.bincount(cohort_of_customer - first_cohort, minlength=num_cohorts)
+
+    rows = activity['rows']
+    order_months = _month_numbers(activity['order_days'])
+    known = rows >= 0
+    period = np.where(known, order_months - cohort_of_customer[rows], -1)
+    in_cohort = period >= 0
+    pre_cohort_orders = int(np.count_nonzero(known & ~in_cohort))
+
+    rows, period = rows[in_cohort], period[in_cohort]
+    num_periods = int(period.max()) + 1 if len(period) else 1
+    cohort = cohort_of_customer[rows] - first_cohort
+    cells = cohort * num_periods + period
+    cell_count = num_cohorts * num_periods
+
+    orders = np.bincount(cells, minlength=cell_count)
+    revenue_cents = np.bincount(cells, weights=activity['amount_cents'][in_cohort], minlength=cell_count)
+
+    # Distinct (customer, period) pairs: each counts once towards its cell
+    pairs = _sorted_unique(rows * num_periods + period)
+    pair_customers = pairs // num_periods
+    pair_cells = (cohort_of_customer[pair_customers] - first_cohort) * num_periods + pairs % num_periods
+    active = np.bincount(pair_cells, minlength=cell_count)
+
+    # Only cells up to the last month with orders are observable (none without orders)
+    last_month = order_months.max() if len(order_months) else first_cohort - 1
+    cohort_index, period_index = np.divmod(np.arange(cell_count), num_periods)
+    observable = (first_cohort + cohort_index + period_index <= last_month) & (cohort_sizes[cohort_index] > 0)
+
+    cohort_index, period_index = cohort_index[observable], period_index[observable]
+    sizes = cohort_sizes[cohort_index]
+    active = active[observable]
+    frame = pd.DataFrame({
+        'cohort_month': [_month_label(first_cohort + c) for c in cohort_index],
+        'months_since_registration': period_index,
+        'cohort_size': sizes,
+        'active_customers': active,
+        'retention_rate': np.round(active * 100.0 / sizes, 1),
+        'orders': orders[observable],
+        'revenue': np.round(revenue_cents[observable] / 100, 2)
+    })
+    return frame, pre_cohort_orders
+
+def retention_matrix(retention):
+    """Cohort x months-since-registration grid of retention rates"""
+    return retention.pivot(
+        index='cohort_month', columns='months_since_registration', values='retention_rate'
+    ).rename_axis(columns=None)
+
+def quintile_scores(values, higher_is_better=True):
+    """1-5 scores by quintile of values, 5 being the best
+
+    Values tied with a quintile edge take the lower bin, so the most common
+    frequency (a single order) scores 1 rather than being pushed upwards.
+    """
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int8)
+    bins = np.searchsorted(np.quantile(values, SCORE_QUANTILES), values, side='left').astype(np.int8)
+    return bins + 1 if higher_is_better else 5 - bins
+
+def rfm_segments(recency_score, frequency_score):
+    """Segment label per customer from the recency and frequency scores"""
+    conditions = [rule(recency_score, frequency_score) for _, rule in RFM_SEGMENTS]
+    return np.select(conditions, [name for name, _ in RFM_SEGMENTS], default='Hibernating')
+
+def rfm_scores(activity, as_of=None):
+    """Recency/frequency/monetary values, 1-5 scores and segment per buying customer
+
+    as_of is the reference day for recency (default: the last order date),
+    so recency_days is 0 for customers who ordered on that day. customer_id
+    is written in its string form (C000001) to join with techgear_customers.
+    """
+    rows = activity['rows']
+    known = rows >= 0
+    rows = rows[known]
+    order_days = activity['order_days'][known]
+    num_customers = len(activity['customer_keys'])
+
+    frequency = np.bincount(rows, minlength=num_customers)
+    monetary_cents = np.bincount(rows, weights=activity['amount_cents'][known], minlength=num_customers)
+    last_order = np.full(num_customers, np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(last_order, rows, order_days)
+
+    buyers = np.flatnonzero(frequency)
+    if as_of is not None:
+        as_of_day = _day_numbers([as_of])[0]
+    else:
+        as_of_day = order_days.max() if len(order_days) else 0
+    recency = as_of_day - last_order[buyers]
+    frequency = frequency[buyers]
+    monetary = np.round(monetary_cents[buyers] / 100, 2)
+
+    r = quintile_scores(recency, higher_is_better=False)
+    f = quintile_scores(frequency)
+    m = quintile_scores(monetary)
+    return pd.DataFrame({
+        'customer_id': format_id_column(activity['customer_keys'][buyers], 'customer_id'),
+        'last_order_date': last_order[buyers].astype('datetime64[D]'),
+        'recency_days': recency,
+        'frequency': frequency,
+        'monetary': monetary,
+        'r_score': r,
+        'f_score': f,
+        'm_score': m,
+        'rfm_score': (r.astype(np.int16) * 100 + f * 10 + m).astype(np.int16),
+        'segment': rfm_segments(r, f)
+    })
+
+def segment_summary(rfm):
+    """Customers, share, averages and revenue per RFM segment"""
+    summary = rfm.groupby('segment', sort=False).agg(
+        customers=('customer_id', 'size'),
+        avg_recency_days=('recency_days', 'mean'),
+        avg_frequency=('frequency', 'mean'),
+        avg_monetary=('monetary', 'mean'),
+        total_revenue=('monetary', 'sum')
+    )
+    summary.insert(1, 'customer_share', summary['customers'] * 100.0 / len(rfm))
+    order = [name for name, _ in RFM_SEGMENTS if name in summary.index]
+    return summary.loc[order].round(
+        {'customer_share': 1, 'avg_recency_days': 1, 'avg_frequency': 2, 'avg_monetary': 2, 'total_revenue': 2}
+    ).reset_index()
+
+def write_results(results, output_dir=PROCESSED_DATA_DIR):
+    """Write each result frame as CSV for the dashboard, replacing files atomically"""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for name, frame in results.items():
+        path = os.path.join(output_dir, OUTPUT_FILES[name])
+        frame.to_csv(path + '.tmp', index=name == 'cohort_matrix')
+        os.replace(path + '.tmp', path)
+        paths[name] = path
+    return paths
+
+def main():
+    """Build cohort retention and RFM tables from the raw data"""
+    parser = argparse.ArgumentParser(description="TechGear Plus cohort retention and RFM segmentation")
+    parser.add_argument('--raw-dir', default=RAW_DATA_DIR, help="directory with the generated data files")
+    parser.add_argument('--output-dir', default=PROCESSED_DATA_DIR, help="directory for the result CSVs")
+    parser.add_argument('--start-date', help="first order date to include (YYYY-MM-DD)")
+    parser.add_argument('--end-date', help="last order date to include (YYYY-MM-DD)")
+    parser.add_argument('--as-of', help="reference date for recency (default: last order date)")
+    args = parser.parse_args()
+
+    print("Building TechGear Plus customer analytics...")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    activity = load_activity(args.raw_dir, args.start_date, args.end_date)
+    loaded = time.perf_counter()
+    retention, pre_cohort_orders = cohort_retention(activity)
+    rfm = rfm_scores(activity, args.as_of)
+    results = {
+        'cohort_retention': retention,
+        'cohort_matrix': retention_matrix(retention),
+        'customer_rfm': rfm,
+        'rfm_segments': segment_summary(rfm)
+    }
+    computed = time.perf_counter()
+    paths = write_results(results, args.output_dir)
+
+    print(f"  Loaded {len(activity['rows']):,} transactions and {len(activity['customer_keys']):,} customers "
+          f"in {loaded - start:.2f}s")
+    print(f"  Cohorts: {retention['cohort_month'].nunique()} months, "
+          f"{pre_cohort_orders:,} orders before their customer's registration month excluded")
+    print(f"  RFM: {len(rfm):,} customers scored")
+    print(f"  Computed in {computed - loaded:.2f}s")
+
+    print("\nRFM Segments:")
+    for _, row in results['rfm_segments'].iterrows():
+        print(f"  {row['segment']}: {row['customers']:,} customers ({row['customer_share']}%), "
+              f"${row['total_revenue']:,.2f} revenue")
+
+    print(f"\n✓ Results written to {args.output_dir}/")
+    for path in paths.values():
+        print(f"  - {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import sqlite3
+import uuid
+
+# Data-version bookkeeping for the TechGear Plus SQLite database.
+#
+# Every writer (the bulk loader, load_sqlite.py --append, rollup refreshes)
+# bumps data_generation in techgear_meta; the full load also stamps a fresh
+# load_id because it replaces the whole database file. Readers combine these with the
+# transaction table's max rowid into a version stamp for cached results.
+
+META_DDL = """CREATE TABLE IF NOT EXISTS techgear_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+)"""
+
+def get_meta(conn, key, default=None):
+    """Read one techgear_meta value"""
+    try:
+        row = conn.execute("SELECT value FROM techgear_meta WHERE key = ?", (key,)).fetchone()
+    except sqlite3.DatabaseError:
+        return default
+    return row[0] if row else default
+
+def set_meta(conn, key, value):
+    """Insert or replace one techgear_meta value"""
+    conn.execute(META_DDL)
+    conn.execute(
+        "INSERT INTO techgear_meta (key, value) VALUES (?, ?) "
+        "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+        (key, str(value))
+    )
+
+def bump_data_generation(conn, new_load=False, previous_generation=None):
+    """Record that the data changed; returns the new generation number
+
+    new_load stamps a fresh load_id, for writers that rebuild the database.
+    previous_generation carries the counter over from a replaced file.
+    """
+    if previous_generation is None:
+        previous_generation = int(get_meta(conn, 'data_generation', 0))
+    generation = previous_generation + 1
+    set_meta(conn, 'data_generation', generation)
+    if new_load or get_meta(conn, 'load_id') is None:
+        set_meta(conn, 'load_id', uuid.uuid4().hex)
+    return generation
+
+def read_data_generation(db_path):
+    """data_generation of an existing database file, 0 if there is none"""
+    try:
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    except sqlite3.DatabaseError:
+        return 0
+    try:
+        return int(get_meta(conn, 'data_generation', 0))
+    finally:
+        conn.close()
+
+def data_version(conn):
+    """Version stamp that changes whenever the loaded data changes"""
+    try:
+        max_rowid = conn.execute("SELECT MAX(rowid) FROM techgear_transactions").fetchone()[0]
+    except sqlite3.OperationalError:
+        max_rowid = None
+    return (get_meta(conn, 'load_id'), get_meta(conn, 'data_generation'), max_rowid)
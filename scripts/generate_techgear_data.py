@@ -2,8 +2,22 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import random
-import uuid
 import os
+import json
+import argparse
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from techgear_io import (
+    RAW_DATA_DIR, COLUMNAR_SUFFIX, PARTITION_SUFFIX, PARTITION_COLUMNS, STATE_FILE, csv_path, parse_ids, read_table,
+    write_columnar, concat_columnar, partition_table
+)
+from techgear_model import (
+    KEY_DTYPE, compact_table, expand_table, restore_money, concat_tables, write_compact_table,
+    money_values, money_cents
+)
+from instrumentation import span, traced, tracing, add_tracing_arguments, check_tracing_arguments
 
 # Set random seed for reproducibility
 np.random.seed(42)
@@ -14,6 +28,32 @@ START_DATE = datetime(2022, 1, 1)
 END_DATE = datetime(2025, 9, 28)
 TOTAL_TRANSACTIONS = 50000
 
+# Streaming generation - rows per chunk and the memory estimates used to size
+# chunks under a --max-memory-mb cap. Measured as peak RSS of --stream over
+# 2M transactions at chunk sizes from 10k to 1M (Python 3.11, pandas 3.0,
+# numpy 2.4): about 520 bytes per chunk row, including the CSV write buffer,
+# above an interpreter/pandas baseline of about 80 MB. Both are rounded up
+# here so the cap holds with some headroom (--max-memory-mb 256 peaked at
+# 195 MB).
+DEFAULT_CHUNK_SIZE = 250000
+BYTES_PER_TRANSACTION_ROW = 600
+BASE_MEMORY_BYTES = 128 * 1024 * 1024
+COPY_BUFFER_BYTES = 16 * 1024 * 1024
+
+# Transactions are drawn in fixed blocks of this many rows per category, each
+# from its own random stream spawned from the seed and keyed by (category,
+# block). Chunk sizes, memory caps and worker counts only regroup whole
+# blocks, so for a given --seed and --transactions every generation mode
+# writes the same dataset.
+TRANSACTION_BLOCK_ROWS = 32768
+
+# Output formats selectable with --format
+OUTPUT_FORMATS = {
+    'csv': ('csv',),
+    'columnar': ('columnar',),
+    'both': ('csv', 'columnar')
+}
+
 # Product categories with business rules
 PRODUCT_CATEGORIES = {
     'Laptops & Computers': {
@@ -77,6 +117,19 @@ CUSTOMER_SEGMENTS = {
     'VIP': {'share': 0.15, 'aov_multiplier': 2.2}
 }
 
+# Customer acquisition channels
+ACQUISITION_CHANNELS = ['Organic Search', 'Paid Search', 'Social Media',
+                        'Email Marketing', 'Referral', 'Direct']
+
+# Order line characteristics
+QUANTITY_CHOICES = [1, 2, 3, 4, 5]
+QUANTITY_WEIGHTS = [0.7, 0.15, 0.08, 0.04, 0.03]
+SHIPPING_RATES = [5.99, 7.99, 9.99]
+
+# Continue mode - every run saves its end date, last IDs and RNG state in
+# STATE_FILE so a later --continue run only generates the new days and appends them
+ANNUAL_GROWTH_RATE = 0.15
+
 def generate_product_catalog():
     """Generate realistic product catalog"""
     products = []
@@ -159,9 +212,7 @@ def generate_customer_base(num_customers=15000):
             p=list(seg['share'] for seg in CUSTOMER_SEGMENTS.values())
         )
         
-        acquisition_channels = ['Organic Search', 'Paid Search', 'Social Media', 
-                              'Email Marketing', 'Referral', 'Direct']
-        acquisition_channel = np.random.choice(acquisition_channels)
+        acquisition_channel = np.random.choice(ACQUISITION_CHANNELS)
         
         customers.append({
             'customer_id': f"C{i+1:06d}",
@@ -175,120 +226,170 @@ def generate_customer_base(num_customers=15000):
     
     return pd.DataFrame(customers)
 
-def generate_sales_transactions(products_df, customers_df):
-    """Generate realistic sales transactions"""
-    transactions = []
-    
-    # Calculate number of transactions per category
+def allocate_category_transactions(total_transactions):
+    """Split the transaction volume across categories by revenue share"""
     category_transactions = {}
     for category, config in PRODUCT_CATEGORIES.items():
-        category_transactions[category] = int(TOTAL_TRANSACTIONS * config['revenue_share'])
+        category_transactions[category] = int(total_transactions * config['revenue_share'])
     
     # Adjust to exact total
     total_allocated = sum(category_transactions.values())
-    if total_allocated != TOTAL_TRANSACTIONS:
+    if total_allocated != total_transactions:
         largest_category = max(category_transactions, key=category_transactions.get)
-        category_transactions[largest_category] += TOTAL_TRANSACTIONS - total_allocated
+        category_transactions[largest_category] += total_transactions - total_allocated
     
-    transaction_id_counter = 1
+    return category_transactions
+
+def build_customer_pool(customers_df):
+    """Precompute customer lookup arrays and the selection distribution"""
+    # Customers are weighted by exp(-(registration_date - order_date).days / 180).
+    # The order_date term is a common factor for every customer, so it cancels
+    # once the weights are normalised: one cumulative distribution serves all
+    # order dates and a draw is a single searchsorted.
+    registration_days = (
+        customers_df['registration_date'] - customers_df['registration_date'].min()
+    ).dt.days.to_numpy()
+    weights = np.exp(-registration_days / 180)
+    cdf = np.cumsum(weights)
     
-    # Generate transactions for each category
-    for category, num_transactions in category_transactions.items():
-        category_products = products_df[products_df['category'] == category]
-        
-        for _ in range(num_transactions):
-            # Random date with business growth trend
-            days_from_start = random.randint(0, (END_DATE - START_DATE).days)
-            order_date = START_DATE + timedelta(days=days_from_start)
-            
-            # Growth factor (15% YoY growth)
-            years_elapsed = (order_date - START_DATE).days / 365.25
-            growth_factor = (1.15 ** years_elapsed)
-            
-            # Seasonal adjustment
-            seasonal_multiplier = get_seasonal_multiplier(order_date, category)
-            
-            # Select customer (weighted toward more recent customers)
-            customer_weights = np.exp(-(customers_df['registration_date'] - order_date).dt.days / 180)
-            customer_weights = customer_weights.fillna(0)
-            if customer_weights.sum() == 0:
-                customer_weights = np.ones(len(customers_df))
-            
-            customer = customers_df.sample(weights=customer_weights).iloc[0]
-            
-            # Select product from category
-            product = category_products.sample().iloc[0]
-            
-            # Determine quantity (most orders are single items)
-            quantity = np.random.choice([1, 2, 3, 4, 5], p=[0.7, 0.15, 0.08, 0.04, 0.03])
-            
-            # Calculate base price with some variation
-            unit_price = product['retail_price'] * np.random.normal(1.0, 0.05)
-            unit_price = max(unit_price * 0.9, unit_price)  # No more than 10% discount
-            unit_price = round(unit_price, 2)
-            
-            # Customer segment adjustment
-            segment_multiplier = CUSTOMER_SEGMENTS[customer['customer_segment']]['aov_multiplier']
-            if segment_multiplier > 1.0:
-                unit_price *= np.random.uniform(1.0, min(1.2, segment_multiplier))
-            
-            # Calculate amounts
-            subtotal = unit_price * quantity
-            
-            # Discount (10% of orders have discounts)
-            discount_amount = 0.0
-            if random.random() < 0.1:
-                discount_amount = subtotal * random.uniform(0.05, 0.20)
-            
-            # Shipping cost
-            if subtotal > 75:
-                shipping_cost = 0.0  # Free shipping over $75
-            else:
-                shipping_cost = random.choice([5.99, 7.99, 9.99])
-            
-            total_amount = subtotal - discount_amount + shipping_cost
-            
-            # Sales channel
-            channel = np.random.choice(
-                list(SALES_CHANNELS.keys()),
-                p=list(ch['share'] for ch in SALES_CHANNELS.values())
-            )
-            
-            # Region
-            region = np.random.choice(
-                list(REGIONS.keys()),
-                p=list(REGIONS.values())
-            )
-            
-            transactions.append({
-                'transaction_id': f"T{transaction_id_counter:07d}",
-                'customer_id': customer['customer_id'],
-                'order_date': order_date,
-                'product_category': category,
-                'product_name': product['product_name'],
-                'product_id': product['product_id'],
-                'quantity': quantity,
-                'unit_price': round(unit_price, 2),
-                'total_amount': round(total_amount, 2),
-                'discount_amount': round(discount_amount, 2),
-                'shipping_cost': round(shipping_cost, 2),
-                'sales_channel': channel,
-                'region': region,
-                'customer_type': customer['customer_segment']
-            })
-            
-            transaction_id_counter += 1
+    return {
+        'cdf': cdf / cdf[-1],
+        'customer_id': parse_ids(customers_df['customer_id'], 'customer_id').astype(KEY_DTYPE),
+        'customer_segment': customers_df['customer_segment'].to_numpy(dtype=object)
+    }
+
+def generate_transaction_batch(category, num_transactions, category_products, customer_pool,
+                               first_transaction_id, rng=np.random, days_from_start=None, categories=None):
+    """Draw a block of transactions for one category as whole arrays
+    
+    rng is the global numpy random module by default, or a RandomState when
+    generating an independently seeded shard. days_from_start optionally fixes
+    each order's date as a day offset from START_DATE (used by continue mode).
+    The batch is returned in the compact model; categories pins its lookup
+    tables (see transaction_categories).
+    """
+    n = num_transactions
+    
+    # Random date across the full business window
+    if days_from_start is None:
+        days_from_start = rng.randint(0, (END_DATE - START_DATE).days + 1, size=n)
+    order_dates = pd.Timestamp(START_DATE) + pd.to_timedelta(days_from_start, unit='D')
+    
+    # Select customers (precomputed CDF) and products (uniform within category)
+    cdf = customer_pool['cdf']
+    customer_idx = np.minimum(np.searchsorted(cdf, rng.random_sample(n), side='right'), len(cdf) - 1)
+    product_idx = rng.randint(0, len(category_products), size=n)
+    segments = customer_pool['customer_segment'][customer_idx]
+    
+    # Determine quantity (most orders are single items)
+    quantity = rng.choice(QUANTITY_CHOICES, size=n, p=QUANTITY_WEIGHTS)
+    
+    # Calculate base price with some variation
+    retail_prices = money_values(category_products['retail_price'])
+    unit_price = np.round(retail_prices[product_idx] * rng.normal(1.0, 0.05, size=n), 2)
+    
+    # Customer segment adjustment
+    segment_multiplier = pd.Series(segments).map(
+        {segment: config['aov_multiplier'] for segment, config in CUSTOMER_SEGMENTS.items()}
+    ).to_numpy()
+    uplifted = segment_multiplier > 1.0
+    unit_price[uplifted] *= rng.uniform(1.0, np.minimum(1.2, segment_multiplier[uplifted]))
+    
+    # Calculate amounts
+    subtotal = unit_price * quantity
+    
+    # Discount (10% of orders have discounts)
+    has_discount = rng.random_sample(n) < 0.1
+    discount_amount = np.where(has_discount, subtotal * rng.uniform(0.05, 0.20, size=n), 0.0)
     
-    return pd.DataFrame(transactions)
+    # Shipping cost - free shipping over $75
+    shipping_cost = np.where(subtotal > 75, 0.0, rng.choice(SHIPPING_RATES, size=n))
+    
+    total_amount = subtotal - discount_amount + shipping_cost
+    
+    # Sales channel and region
+    channel_names = np.array(list(SALES_CHANNELS.keys()), dtype=object)
+    channels = channel_names[rng.choice(
+        len(channel_names), size=n, p=[ch['share'] for ch in SALES_CHANNELS.values()]
+    )]
+    region_names = np.array(list(REGIONS.keys()), dtype=object)
+    regions = region_names[rng.choice(len(region_names), size=n, p=list(REGIONS.values()))]
+    
+    transactions_df = pd.DataFrame({
+        'transaction_id': np.arange(first_transaction_id, first_transaction_id + n, dtype=KEY_DTYPE),
+        'customer_id': customer_pool['customer_id'][customer_idx],
+        'order_date': order_dates,
+        'product_category': category,
+        'product_name': category_products['product_name'].to_numpy(dtype=object)[product_idx],
+        'product_id': parse_ids(category_products['product_id'], 'product_id')[product_idx],
+        'quantity': quantity,
+        'unit_price': np.round(unit_price, 2),
+        'total_amount': np.round(total_amount, 2),
+        'discount_amount': np.round(discount_amount, 2),
+        'shipping_cost': np.round(shipping_cost, 2),
+        'sales_channel': channels,
+        'region': regions,
+        'customer_type': segments
+    })
+    return compact_table(transactions_df, 'techgear_transactions', categories)
+
+def block_rng(seed, category_number, block_number):
+    """Random stream for one block of a category's transactions"""
+    seed_sequence = np.random.SeedSequence(seed, spawn_key=(category_number, block_number))
+    return np.random.RandomState(np.random.MT19937(seed_sequence))
+
+def iter_category_transactions(category_number, num_transactions, category_products, customer_pool,
+                               first_transaction_id, seed, chunk_size, categories=None,
+                               first_block=0, end_block=None):
+    """Yield a category's transactions in chunks of at most chunk_size rows
+    
+    Blocks first_block up to (not including) end_block of the category are
+    generated, each from block_rng, and sliced or concatenated into chunks.
+    """
+    category = list(PRODUCT_CATEGORIES)[category_number]
+    num_blocks = -(-num_transactions // TRANSACTION_BLOCK_ROWS)
+    end_block = num_blocks if end_block is None else min(end_block, num_blocks)
+    pending = []
+    pending_rows = 0
+    
+    for block_number in range(first_block, end_block):
+        block_start = block_number * TRANSACTION_BLOCK_ROWS
+        block_size = min(TRANSACTION_BLOCK_ROWS, num_transactions - block_start)
+        block = generate_transaction_batch(
+            category, block_size, category_products, customer_pool, first_transaction_id + block_start,
+            block_rng(seed, category_number, block_number), categories=categories
+        )
+        offset = 0
+        while offset < block_size:
+            take = min(chunk_size - pending_rows, block_size - offset)
+            pending.append(block if take == block_size else block.iloc[offset:offset + take])
+            pending_rows += take
+            offset += take
+            if pending_rows == chunk_size:
+                yield pending[0] if len(pending) == 1 else concat_tables(pending)
+                pending = []
+                pending_rows = 0
+    
+    if pending:
+        yield pending[0] if len(pending) == 1 else concat_tables(pending)
+
+def generate_sales_transactions(products_df, customers_df, total_transactions=TOTAL_TRANSACTIONS, seed=42):
+    """Generate realistic sales transactions"""
+    return concat_tables(iter_sales_transactions(
+        products_df, customers_df, total_transactions, max(total_transactions, 1), seed
+    ))
 
 def update_customer_metrics(customers_df, transactions_df):
     """Update customer metrics based on transactions"""
-    customer_stats = transactions_df.groupby('customer_id').agg({
+    # Sum money as exact float64 even when the column is stored as float32
+    amounts = transactions_df.assign(total_amount=money_values(transactions_df['total_amount']))
+    customer_stats = amounts.groupby('customer_id').agg({
         'total_amount': ['count', 'sum'],
         'order_date': 'max'
-    }).round(2)
+    })
     
     customer_stats.columns = ['calculated_orders', 'calculated_spent', 'calculated_last_date']
+    customer_stats['calculated_spent'] = customer_stats['calculated_spent'].round(2)
     
     # Update customers dataframe - drop old columns first to avoid overlap
     customers_clean = customers_df.drop(columns=['total_orders', 'total_spent', 'last_order_date'], errors='ignore')
@@ -307,81 +408,621 @@ def update_customer_metrics(customers_df, transactions_df):
         'calculated_spent': 'total_spent', 
         'calculated_last_date': 'last_order_date'
     })
+    customers_updated['total_orders'] = customers_updated['total_orders'].astype(customers_df['total_orders'].dtype)
     
-    return customers_updated.reset_index()
+    # Keep the key dtype (the join widens integer keys)
+    return customers_updated.reset_index().astype({'customer_id': customers_df['customer_id'].dtype})
 
-def main():
-    """Generate complete TechGear Plus dataset"""
-    print("Generating TechGear Plus Sales Dataset...")
-    print("=" * 50)
+def build_customer_index(customers_df):
+    """Map customer_id -> row position for incremental metric updates"""
+    customer_index = pd.Index(customers_df['customer_id'])
+    if not customer_index.is_unique:
+        raise ValueError("customer_id values must be unique")
+    return customer_index
+
+def apply_transaction_batch(customers_df, transactions_df, customer_index=None):
+    """Fold a batch of new transactions into the customer metrics in place
     
-    # Generate datasets
-    print("1. Creating product catalog...")
-    products_df = generate_product_catalog()
-    print(f"   Generated {len(products_df)} products across {len(PRODUCT_CATEGORIES)} categories")
+    Only the customers that appear in the batch are touched, so the cost
+    scales with the batch rather than the whole transaction history. The
+    result matches update_customer_metrics over all transactions so far.
+    Pass a customer_index from build_customer_index to reuse it across
+    batches; it must be rebuilt when customers are added or reordered.
+    """
+    if customer_index is None:
+        customer_index = build_customer_index(customers_df)
+    if len(transactions_df) == 0:
+        return customers_df
     
-    print("2. Creating customer base...")
-    customers_df = generate_customer_base()
-    print(f"   Generated {len(customers_df)} customers")
+    positions = customer_index.get_indexer(transactions_df['customer_id'])
+    if (positions < 0).any():
+        raise ValueError("Transactions reference customers missing from the customer base")
     
-    print("3. Generating sales transactions...")
-    transactions_df = generate_sales_transactions(products_df, customers_df)
-    print(f"   Generated {len(transactions_df)} transactions")
+    # Aggregate the batch per touched customer
+    touched, inverse = np.unique(positions, return_inverse=True)
+    cents = money_cents(transactions_df['total_amount'])
+    batch_orders = np.bincount(inverse, minlength=len(touched))
+    batch_cents = np.rint(np.bincount(inverse, weights=cents, minlength=len(touched))).astype(np.int64)
     
-    print("4. Updating customer metrics...")
-    customers_df = update_customer_metrics(customers_df, transactions_df)
+    order_dates = transactions_df['order_date'].to_numpy()
+    batch_last = np.full(len(touched), np.datetime64('NaT'), dtype=order_dates.dtype)
+    np.fmax.at(batch_last, inverse, order_dates)
     
-    # Save to CSV files in the raw data folder
-    print("5. Saving datasets...")
+    # Customers fresh from generate_customer_base carry None placeholders
+    if not pd.api.types.is_datetime64_any_dtype(customers_df['last_order_date']):
+        customers_df['last_order_date'] = pd.to_datetime(customers_df['last_order_date']).astype(order_dates.dtype)
     
-    # Create raw data directory if it doesn't exist
-    raw_data_dir = '../data/raw'
-    os.makedirs(raw_data_dir, exist_ok=True)
+    orders_col = customers_df.columns.get_loc('total_orders')
+    spent_col = customers_df.columns.get_loc('total_spent')
+    last_col = customers_df.columns.get_loc('last_order_date')
     
-    # Save CSV files to raw data folder
-    products_df.to_csv(f'{raw_data_dir}/techgear_products.csv', index=False)
-    customers_df.to_csv(f'{raw_data_dir}/techgear_customers.csv', index=False)
-    transactions_df.to_csv(f'{raw_data_dir}/techgear_transactions.csv', index=False)
+    # Money is carried in integer cents so repeated batches never drift
+    current_cents = money_cents(customers_df['total_spent'].to_numpy()[touched])
+    current_last = customers_df['last_order_date'].to_numpy()[touched].astype(order_dates.dtype)
     
-    # Display summary statistics
+    orders = customers_df['total_orders'].to_numpy()
+    customers_df.iloc[touched, orders_col] = (orders[touched] + batch_orders).astype(orders.dtype)
+    customers_df.iloc[touched, spent_col] = (current_cents + batch_cents) / 100
+    customers_df.iloc[touched, last_col] = np.fmax(current_last, batch_last)
+    
+    return customers_df
+
+def transaction_categories(products_df):
+    """Fixed dictionaries for the transaction table's category columns"""
+    # Pinning the dictionaries up front keeps category codes identical across
+    # chunks and shards, so columnar parts can be concatenated byte for byte
+    return {
+        'product_category': list(PRODUCT_CATEGORIES),
+        'product_name': list(pd.unique(products_df['product_name'])),
+        'sales_channel': list(SALES_CHANNELS),
+        'region': list(REGIONS),
+        'customer_type': list(CUSTOMER_SEGMENTS)
+    }
+
+def iter_sales_transactions(products_df, customers_df, total_transactions=TOTAL_TRANSACTIONS,
+                            chunk_size=DEFAULT_CHUNK_SIZE, seed=42):
+    """Yield sales transactions in chunks of at most chunk_size rows"""
+    customer_pool = build_customer_pool(customers_df)
+    categories = transaction_categories(products_df)
+    transaction_id_counter = 1
+    
+    for category_number, (category, num_transactions) in enumerate(
+            allocate_category_transactions(total_transactions).items()):
+        category_products = products_df[products_df['category'] == category]
+        yield from iter_category_transactions(
+            category_number, num_transactions, category_products, customer_pool, transaction_id_counter,
+            seed, chunk_size, categories
+        )
+        transaction_id_counter += num_transactions
+
+def init_customer_totals(customers_df):
+    """Create running per-customer aggregates for streamed transactions"""
+    num_customers = len(customers_df)
+    return {
+        'index': pd.Index(customers_df['customer_id']),
+        'orders': np.zeros(num_customers, dtype=np.int64),
+        'spent_cents': np.zeros(num_customers, dtype=np.int64),
+        # Days since epoch of the latest order, -1 where there is none yet
+        'last_order_day': np.full(num_customers, -1, dtype=np.int64)
+    }
+
+def accumulate_customer_totals(totals, transactions_df):
+    """Fold a chunk of transactions into the running customer aggregates"""
+    positions = totals['index'].get_indexer(transactions_df['customer_id'])
+    if (positions < 0).any():
+        raise ValueError("Transactions reference customers missing from the customer base")
+    
+    num_customers = len(totals['orders'])
+    cents = money_cents(transactions_df['total_amount'])
+    totals['orders'] += np.bincount(positions, minlength=num_customers)
+    totals['spent_cents'] += np.bincount(positions, weights=cents, minlength=num_customers).astype(np.int64)
+    
+    order_days = transactions_df['order_date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    np.maximum.at(totals['last_order_day'], positions, order_days)
+
+def apply_customer_totals(customers_df, totals):
+    """Write running aggregates into the customer metric columns"""
+    customers_updated = customers_df.copy()
+    last_order_day = totals['last_order_day']
+    
+    customers_updated['total_orders'] = totals['orders'].astype(customers_df['total_orders'].dtype)
+    customers_updated['total_spent'] = totals['spent_cents'] / 100
+    customers_updated['last_order_date'] = pd.to_datetime(
+        np.where(last_order_day >= 0, last_order_day, np.iinfo(np.int64).min).astype('datetime64[D]')
+    )
+    
+    return customers_updated
+
+def summarize_transactions(transactions_df):
+    """Collect the revenue figures printed in the dataset summary"""
+    amounts = pd.Series(money_values(transactions_df['total_amount']), index=transactions_df.index)
+    return {
+        'orders': len(transactions_df),
+        'revenue': amounts.sum(),
+        'first_date': transactions_df['order_date'].min(),
+        'last_date': transactions_df['order_date'].max(),
+        'category_revenue': amounts.groupby(transactions_df['product_category'], observed=True).sum(),
+        'channel_revenue': amounts.groupby(transactions_df['sales_channel'], observed=True).sum(),
+        'segment_revenue': amounts.groupby(transactions_df['customer_type'], observed=True).agg(['sum', 'count'])
+    }
+
+def merge_summaries(left, right):
+    """Combine two transaction summaries"""
+    if left is None:
+        return right
+    return {
+        'orders': left['orders'] + right['orders'],
+        'revenue': left['revenue'] + right['revenue'],
+        'first_date': min(left['first_date'], right['first_date']),
+        'last_date': max(left['last_date'], right['last_date']),
+        'category_revenue': left['category_revenue'].add(right['category_revenue'], fill_value=0),
+        'channel_revenue': left['channel_revenue'].add(right['channel_revenue'], fill_value=0),
+        'segment_revenue': left['segment_revenue'].add(right['segment_revenue'], fill_value=0)
+    }
+
+def stream_sales_transactions(products_df, customers_df, output_dir, total_transactions=TOTAL_TRANSACTIONS,
+                              chunk_size=DEFAULT_CHUNK_SIZE, formats=('csv',), seed=42):
+    """Generate transactions chunk by chunk, appending each chunk to the output files
+    
+    Only one chunk is held in memory at a time. Returns the customer table with
+    updated metrics and the dataset summary, both built from running aggregates.
+    """
+    totals = init_customer_totals(customers_df)
+    summary = None
+    categories = transaction_categories(products_df)
+    
+    for chunk_number, chunk in enumerate(iter_sales_transactions(
+            products_df, customers_df, total_transactions, chunk_size, seed)):
+        write_compact_table(chunk, 'techgear_transactions', output_dir, formats,
+                    append=chunk_number > 0, categories=categories)
+        accumulate_customer_totals(totals, chunk)
+        summary = merge_summaries(summary, summarize_transactions(chunk))
+    
+    return apply_customer_totals(customers_df, totals), summary
+
+def chunk_size_for_memory(max_memory_mb, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Cap the chunk size so a generated chunk fits in the memory budget"""
+    budget = max_memory_mb * 1024 * 1024 - BASE_MEMORY_BYTES
+    if budget < BYTES_PER_TRANSACTION_ROW * 1000:
+        raise ValueError(f"Memory cap of {max_memory_mb} MB is too small for streaming generation")
+    return min(chunk_size, budget // BYTES_PER_TRANSACTION_ROW)
+
+def merge_customer_totals(totals, other):
+    """Fold another set of running customer aggregates into totals"""
+    totals['orders'] += other['orders']
+    totals['spent_cents'] += other['spent_cents']
+    np.maximum(totals['last_order_day'], other['last_order_day'], out=totals['last_order_day'])
+
+def plan_shards(total_transactions, workers):
+    """Split each category's transaction blocks into one contiguous run per worker"""
+    shards = []
+    transaction_id_counter = 1
+    
+    for category_number, num_transactions in enumerate(allocate_category_transactions(total_transactions).values()):
+        num_blocks = -(-num_transactions // TRANSACTION_BLOCK_ROWS)
+        for part in range(workers):
+            first_block = (num_blocks * part) // workers
+            end_block = (num_blocks * (part + 1)) // workers
+            if end_block > first_block:
+                shards.append({
+                    'category_number': category_number,
+                    'num_transactions': num_transactions,
+                    'first_block': first_block,
+                    'end_block': end_block,
+                    'first_transaction_id': transaction_id_counter
+                })
+        transaction_id_counter += num_transactions
+    
+    return shards
+
+# Per-process state shared by every shard a pool worker generates
+_shard_context = {}
+
+def _init_shard_worker(products_df, customers_df):
+    """Pool initializer - receive the catalog and customer base once per process"""
+    _shard_context['categories'] = transaction_categories(products_df)
+    _shard_context['products'] = products_df
+    _shard_context['customers'] = customers_df
+    _shard_context['customer_pool'] = build_customer_pool(customers_df)
+
+def _generate_shard(shard, seed, part_path, chunk_size, write_header, formats):
+    """Generate one shard into its own part file(s)"""
+    products_df = _shard_context['products']
+    category = list(PRODUCT_CATEGORIES)[shard['category_number']]
+    category_products = products_df[products_df['category'] == category]
+    totals = init_customer_totals(_shard_context['customers'])
+    summary = None
+    
+    for chunk_number, chunk in enumerate(iter_category_transactions(
+            shard['category_number'], shard['num_transactions'], category_products,
+            _shard_context['customer_pool'], shard['first_transaction_id'], seed, chunk_size,
+            _shard_context['categories'], shard['first_block'], shard['end_block'])):
+        if 'csv' in formats:
+            expand_table(chunk, 'techgear_transactions').to_csv(
+                part_path, mode='a', header=write_header and chunk_number == 0, index=False
+            )
+        if 'columnar' in formats:
+            write_columnar(restore_money(chunk, 'techgear_transactions'), 'techgear_transactions', append=True,
+                           categories=_shard_context['categories'],
+                           bundle_dir=part_path + COLUMNAR_SUFFIX)
+        accumulate_customer_totals(totals, chunk)
+        summary = merge_summaries(summary, summarize_transactions(chunk))
+    
+    # The customer index is rebuilt by the parent; only ship the arrays back
+    del totals['index']
+    return totals, summary
+
+def generate_sharded_transactions(products_df, customers_df, output_dir, total_transactions=TOTAL_TRANSACTIONS,
+                                  workers=2, seed=42, chunk_size=DEFAULT_CHUNK_SIZE, formats=('csv',)):
+    """Generate transactions across a process pool and merge the shards into one table
+    
+    Shards are whole runs of transaction blocks, each drawn from its own
+    block_rng stream, so the output is byte-for-byte the same as the
+    single-process modes for any worker count and chunk size. Shards are
+    concatenated in plan order, which keeps transaction IDs contiguous.
+    """
+    shards = plan_shards(total_transactions, workers)
+    shard_dir = tempfile.mkdtemp(prefix='.shards-', dir=output_dir)
+    part_paths = [os.path.join(shard_dir, f'part-{i:05d}.csv') for i in range(len(shards))]
+    
+    totals = init_customer_totals(customers_df)
+    summary = None
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker,
+                                 initargs=(products_df, customers_df)) as pool:
+            results = pool.map(
+                _generate_shard, shards, [seed] * len(shards), part_paths,
+                [chunk_size] * len(shards), [i == 0 for i in range(len(shards))],
+                [formats] * len(shards)
+            )
+            for shard_totals, shard_summary in results:
+                merge_customer_totals(totals, shard_totals)
+                summary = merge_summaries(summary, shard_summary)
+        
+        if 'csv' in formats:
+            with open(csv_path('techgear_transactions', output_dir), 'wb') as output_file:
+                for part_path in part_paths:
+                    with open(part_path, 'rb') as part_file:
+                        shutil.copyfileobj(part_file, output_file, COPY_BUFFER_BYTES)
+        if 'columnar' in formats:
+            concat_columnar([part_path + COLUMNAR_SUFFIX for part_path in part_paths],
+                            'techgear_transactions', output_dir)
+        if 'partitioned' in formats:
+            # Month partitions span shards, so they are cut from the merged output
+            partition_table('techgear_transactions', output_dir)
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+    
+    return apply_customer_totals(customers_df, totals), summary
+
+def generate_new_customers(num_customers, first_customer_number, first_date, num_days, rng=np.random):
+    """Generate customers who register within a date range
+    
+    Segments and acquisition channels follow generate_customer_base; the
+    registration date is uniform over the num_days starting at first_date.
+    """
+    n = num_customers
+    segment_names = np.array(list(CUSTOMER_SEGMENTS), dtype=object)
+    segments = segment_names[rng.choice(
+        len(segment_names), size=n, p=[seg['share'] for seg in CUSTOMER_SEGMENTS.values()]
+    )]
+    channels = np.array(ACQUISITION_CHANNELS, dtype=object)[rng.randint(0, len(ACQUISITION_CHANNELS), size=n)]
+    registration_days = rng.randint(0, num_days, size=n)
+    
+    return pd.DataFrame({
+        'customer_id': np.arange(first_customer_number, first_customer_number + n, dtype=KEY_DTYPE),
+        'registration_date': pd.Timestamp(first_date) + pd.to_timedelta(registration_days, unit='D'),
+        'customer_segment': segments,
+        'acquisition_channel': channels,
+        'total_orders': np.zeros(n, dtype=int),
+        'total_spent': np.zeros(n),
+        'last_order_date': pd.NaT
+    })
+
+def growth_multiplier(date, anchor_date):
+    """Compounded ANNUAL_GROWTH_RATE between the anchor date and date"""
+    return (1 + ANNUAL_GROWTH_RATE) ** ((date - anchor_date).days / 365.25)
+
+def daily_category_volumes(first_date, num_days, base_daily_transactions, anchor_date, rng=np.random):
+    """Draw each category's order count for every day in a date range
+    
+    The expected count is the base daily volume split by revenue share, grown
+    from the anchor date and scaled by get_seasonal_multiplier.
+    """
+    dates = [first_date + timedelta(days=d) for d in range(num_days)]
+    volumes = {}
+    for category, config in PRODUCT_CATEGORIES.items():
+        expected = [
+            base_daily_transactions * config['revenue_share']
+            * growth_multiplier(date, anchor_date) * get_seasonal_multiplier(date, category)
+            for date in dates
+        ]
+        volumes[category] = rng.poisson(expected)
+    return volumes
+
+def state_path(output_dir):
+    """Location of the continue-mode state file"""
+    return os.path.join(output_dir, STATE_FILE)
+
+def save_generator_state(output_dir, state, rng=np.random):
+    """Record where this run stopped, including the RNG state"""
+    _, keys, pos, has_gauss, cached_gaussian = rng.get_state()
+    state = dict(state, rng_state={
+        'keys': keys.tolist(), 'pos': int(pos),
+        'has_gauss': int(has_gauss), 'cached_gaussian': float(cached_gaussian)
+    })
+    tmp_path = state_path(output_dir) + '.tmp'
+    with open(tmp_path, 'w') as state_file:
+        json.dump(state, state_file, indent=2)
+    os.replace(tmp_path, state_path(output_dir))
+
+def load_generator_state(output_dir):
+    """Read the saved run state; returns (state, RandomState positioned where it stopped)"""
+    if not os.path.exists(state_path(output_dir)):
+        raise FileNotFoundError(
+            f"No {STATE_FILE} in {output_dir} - generate a dataset without --continue first"
+        )
+    with open(state_path(output_dir)) as state_file:
+        state = json.load(state_file)
+    
+    saved = state['rng_state']
+    rng = np.random.RandomState()
+    rng.set_state(('MT19937', np.array(saved['keys'], dtype=np.uint32), saved['pos'],
+                   saved['has_gauss'], saved['cached_gaussian']))
+    return state, rng
+
+def initial_generator_state(customers_df, total_transactions, seed, formats):
+    """State describing a freshly generated START_DATE..END_DATE dataset"""
+    business_days = (END_DATE - START_DATE).days + 1
+    return {
+        'seed': seed,
+        'formats': list(formats),
+        'end_date': END_DATE.strftime('%Y-%m-%d'),
+        'last_transaction_id': total_transactions,
+        'last_customer_id': len(customers_df),
+        # Volume at END_DATE that continued days grow from
+        'growth_anchor_date': END_DATE.strftime('%Y-%m-%d'),
+        'base_daily_transactions': total_transactions / business_days,
+        # generate_customer_base draws registrations ~ Exponential(365 days)
+        # back from END_DATE, so signups at the end run at N / 365 per day
+        'base_daily_customers': len(customers_df) / 365
+    }
+
+def continue_dataset(output_dir, num_days):
+    """Extend a generated dataset by num_days of new customers and orders
+    
+    Only the new days are generated: transactions are appended to the
+    existing outputs and customer metrics are updated incrementally, so the
+    cost follows the new volume rather than the size of the history.
+    Returns (customers_df, summary of the new transactions, first new date).
+    """
+    if num_days < 1:
+        raise ValueError(f"num_days must be at least 1, got {num_days}")
+    state, rng = load_generator_state(output_dir)
+    formats = tuple(state['formats'])
+    first_date = datetime.strptime(state['end_date'], '%Y-%m-%d') + timedelta(days=1)
+    anchor_date = datetime.strptime(state['growth_anchor_date'], '%Y-%m-%d')
+    
+    products_df = compact_table(read_table('techgear_products', output_dir), 'techgear_products')
+    customers_df = compact_table(read_table('techgear_customers', output_dir), 'techgear_customers')
+    
+    # Newly registered customers, growing with the business
+    expected_customers = state['base_daily_customers'] * sum(
+        growth_multiplier(first_date + timedelta(days=d), anchor_date) for d in range(num_days)
+    )
+    new_customers = generate_new_customers(
+        rng.poisson(expected_customers), state['last_customer_id'] + 1, first_date, num_days, rng
+    )
+    customers_df = concat_tables([customers_df, compact_table(new_customers, 'techgear_customers')])
+    
+    customer_pool = build_customer_pool(customers_df)
+    categories = transaction_categories(products_df)
+    first_day_offset = (first_date - START_DATE).days
+    transaction_id_counter = state['last_transaction_id'] + 1
+    batches = []
+    
+    for category, day_counts in daily_category_volumes(
+            first_date, num_days, state['base_daily_transactions'], anchor_date, rng).items():
+        days_from_start = np.repeat(first_day_offset + np.arange(num_days), day_counts)
+        category_products = products_df[products_df['category'] == category]
+        batches.append(generate_transaction_batch(
+            category, len(days_from_start), category_products, customer_pool,
+            transaction_id_counter, rng, days_from_start, categories
+        ))
+        transaction_id_counter += len(days_from_start)
+    
+    transactions_df = concat_tables(batches)
+    apply_transaction_batch(customers_df, transactions_df)
+    
+    write_compact_table(transactions_df, 'techgear_transactions', output_dir, formats, append=True,
+                        categories=categories)
+    write_compact_table(customers_df, 'techgear_customers', output_dir, formats)
+    
+    state.update({
+        'end_date': (first_date + timedelta(days=num_days - 1)).strftime('%Y-%m-%d'),
+        'last_transaction_id': transaction_id_counter - 1,
+        'last_customer_id': state['last_customer_id'] + len(new_customers)
+    })
+    save_generator_state(output_dir, state, rng)
+    
+    return customers_df, summarize_transactions(transactions_df), first_date
+
+def print_dataset_summary(summary):
+    """Print revenue, channel and segment highlights"""
     print("\n" + "=" * 50)
     print("DATASET SUMMARY")
     print("=" * 50)
     
-    print(f"Total Revenue: ${transactions_df['total_amount'].sum():,.2f}")
-    print(f"Average Order Value: ${transactions_df['total_amount'].mean():.2f}")
-    print(f"Date Range: {transactions_df['order_date'].min()} to {transactions_df['order_date'].max()}")
+    print(f"Total Revenue: ${summary['revenue']:,.2f}")
+    print(f"Average Order Value: ${summary['revenue'] / summary['orders']:.2f}")
+    print(f"Date Range: {summary['first_date']} to {summary['last_date']}")
     
     print("\nRevenue by Category:")
-    category_revenue = transactions_df.groupby('product_category')['total_amount'].sum().sort_values(ascending=False)
+    category_revenue = summary['category_revenue'].sort_values(ascending=False)
     for category, revenue in category_revenue.items():
-        percentage = (revenue / transactions_df['total_amount'].sum()) * 100
+        percentage = (revenue / summary['revenue']) * 100
         print(f"  {category}: ${revenue:,.2f} ({percentage:.1f}%)")
     
     print("\nRevenue by Channel:")
-    channel_revenue = transactions_df.groupby('sales_channel')['total_amount'].sum().sort_values(ascending=False)
+    channel_revenue = summary['channel_revenue'].sort_values(ascending=False)
     for channel, revenue in channel_revenue.items():
-        percentage = (revenue / transactions_df['total_amount'].sum()) * 100
+        percentage = (revenue / summary['revenue']) * 100
         print(f"  {channel}: ${revenue:,.2f} ({percentage:.1f}%)")
     
     print("\nCustomer Segments:")
-    segment_stats = transactions_df.groupby('customer_type').agg({
-        'total_amount': ['mean', 'count']
-    }).round(2)
+    segment_stats = summary['segment_revenue']
     for segment in segment_stats.index:
-        avg_order = segment_stats.loc[segment, ('total_amount', 'mean')]
-        order_count = segment_stats.loc[segment, ('total_amount', 'count')]
+        order_count = int(segment_stats.loc[segment, 'count'])
+        avg_order = segment_stats.loc[segment, 'sum'] / order_count
         print(f"  {segment}: {order_count} orders, ${avg_order:.2f} avg order value")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Generate the TechGear Plus sales dataset")
+    parser.add_argument('--transactions', type=int, default=TOTAL_TRANSACTIONS,
+                        help="number of transactions to generate")
+    parser.add_argument('--output-dir', default=RAW_DATA_DIR,
+                        help="directory for the generated CSV files")
+    parser.add_argument('--stream', action='store_true',
+                        help="generate and write transactions in fixed-size chunks")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per chunk in streaming mode (does not change the generated data)")
+    parser.add_argument('--max-memory-mb', type=int,
+                        help="cap the chunk size so streaming stays within this memory budget")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="generate transactions in parallel across this many processes")
+    parser.add_argument('--seed', type=int, default=42,
+                        help="master random seed; with --transactions it determines the dataset in every mode")
+    parser.add_argument('--format', choices=sorted(OUTPUT_FORMATS), default='csv',
+                        help="write CSV, columnar bundles, or both")
+    parser.add_argument('--partition-by-month', action='store_true',
+                        help="also write transactions as month partitions for date-range readers")
+    parser.add_argument('--continue', dest='continue_run', action='store_true',
+                        help="extend the dataset in --output-dir instead of regenerating it")
+    parser.add_argument('--days', type=int, default=1,
+                        help="days to add in --continue mode")
+    add_tracing_arguments(parser)
+    args = parser.parse_args(argv)
+    check_tracing_arguments(parser, args)
+    if args.days < 1:
+        parser.error(f"--days must be at least 1, got {args.days}")
+    return args
+
+@traced('continue_dataset')
+def continue_main(args):
+    """Append --days of new data to the dataset in --output-dir"""
+    print(f"Extending TechGear Plus Sales Dataset by {args.days} day(s)...")
+    print("=" * 50)
+    
+    customers_df, summary, first_date = continue_dataset(args.output_dir, args.days)
+    last_date = first_date + timedelta(days=args.days - 1)
+    print(f"Appended {summary['orders']} transactions for {first_date:%Y-%m-%d} to {last_date:%Y-%m-%d}")
+    print(f"Customer base is now {len(customers_df)} customers")
+    print_dataset_summary(summary)
+
+@traced('generate_techgear_data')
+def generate_main(args):
+    """Generate the products, customers and transactions from scratch"""
+    print("Generating TechGear Plus Sales Dataset...")
+    print("=" * 50)
+    
+    # Generate datasets
+    print("1. Creating product catalog...")
+    with span('Creating product catalog') as stage:
+        products_df = compact_table(generate_product_catalog(), 'techgear_products')
+        stage.count(len(products_df))
+    print(f"   Generated {len(products_df)} products across {len(PRODUCT_CATEGORIES)} categories")
     
-    print(f"\nFiles created in data/raw/ folder:")
-    print("  - techgear_products.csv")
-    print("  - techgear_customers.csv") 
-    print("  - techgear_transactions.csv")
+    print("2. Creating customer base...")
+    with span('Creating customer base') as stage:
+        customers_df = compact_table(generate_customer_base(), 'techgear_customers')
+        stage.count(len(customers_df))
+    print(f"   Generated {len(customers_df)} customers")
+    
+    # Create raw data directory if it doesn't exist
+    raw_data_dir = args.output_dir
+    os.makedirs(raw_data_dir, exist_ok=True)
+    formats = OUTPUT_FORMATS[args.format]
+    if args.partition_by_month:
+        formats += ('partitioned',)
+    
+    chunk_size = args.chunk_size
+    if args.max_memory_mb:
+        chunk_size = chunk_size_for_memory(args.max_memory_mb, chunk_size)
+    
+    if args.workers > 1:
+        print(f"3. Generating sales transactions across {args.workers} worker processes...")
+        with span('Generating sales transactions', mode='sharded', workers=args.workers) as stage:
+            customers_df, summary = generate_sharded_transactions(
+                products_df, customers_df, raw_data_dir, args.transactions,
+                args.workers, args.seed, chunk_size, formats
+            )
+            stage.count(summary['orders'])
+        print(f"   Generated {summary['orders']} transactions")
+        print("4. Updated customer metrics from merged shard totals")
+    elif args.stream or args.max_memory_mb:
+        print(f"3. Streaming sales transactions in chunks of {chunk_size:,}...")
+        with span('Generating sales transactions', mode='stream', chunk_size=chunk_size) as stage:
+            customers_df, summary = stream_sales_transactions(
+                products_df, customers_df, raw_data_dir, args.transactions, chunk_size, formats, args.seed
+            )
+            stage.count(summary['orders'])
+        print(f"   Generated {summary['orders']} transactions")
+        print("4. Updated customer metrics from running totals")
+    else:
+        print("3. Generating sales transactions...")
+        with span('Generating sales transactions', mode='memory') as stage:
+            transactions_df = generate_sales_transactions(products_df, customers_df, args.transactions, args.seed)
+            stage.count(len(transactions_df))
+        print(f"   Generated {len(transactions_df)} transactions")
+        
+        print("4. Updating customer metrics...")
+        with span('Updating customer metrics') as stage:
+            customers_df = update_customer_metrics(customers_df, transactions_df)
+            summary = summarize_transactions(transactions_df)
+            stage.count(len(transactions_df))
+        with span('Writing transactions', formats=list(formats)) as stage:
+            write_compact_table(transactions_df, 'techgear_transactions', raw_data_dir, formats,
+                                categories=transaction_categories(products_df))
+            stage.count(len(transactions_df))
+    
+    # Save the remaining tables to the raw data folder
+    print("5. Saving datasets...")
+    with span('Saving datasets', formats=list(formats)) as stage:
+        write_compact_table(products_df, 'techgear_products', raw_data_dir, formats)
+        write_compact_table(customers_df, 'techgear_customers', raw_data_dir, formats)
+        save_generator_state(raw_data_dir, initial_generator_state(customers_df, args.transactions, args.seed, formats))
+        stage.count(len(products_df) + len(customers_df))
+    
+    # Display summary statistics
+    print_dataset_summary(summary)
+    
+    print(f"\nFiles created in {raw_data_dir}/ folder:")
+    for table in ('techgear_products', 'techgear_customers', 'techgear_transactions'):
+        if 'csv' in formats:
+            print(f"  - {table}.csv")
+        if 'columnar' in formats:
+            print(f"  - {table}{COLUMNAR_SUFFIX}/")
+        if 'partitioned' in formats and table in PARTITION_COLUMNS:
+            print(f"  - {table}{PARTITION_SUFFIX}/")
     
     print("\nNext Steps:")
-    print("1. Upload CSV files to SQLite Online")
-    print("2. Run the database setup queries")
+    print("1. Load the data into SQLite: python load_sqlite.py")
+    print("2. Run the dashboard queries in ../sql/")
     print("3. Start building your Tableau dashboard!")
 
+def main(argv=None):
+    """Generate complete TechGear Plus dataset"""
+    args = parse_args(argv)
+    np.random.seed(args.seed)
+    random.seed(args.seed)
+    
+    with tracing(args.trace, args.profile_dir, args.trace_memory):
+        if args.continue_run:
+            continue_main(args)
+        else:
+            generate_main(args)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
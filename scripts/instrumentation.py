@@ -0,0 +1,215 @@
+import cProfile
+import functools
+import json
+import os
+import re
+import resource
+import sys
+import time
+import tracemalloc
+import traceback
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# Stage-level instrumentation for the pipeline scripts.
+#
+# Code marks its stages with span() (a context manager) or @traced; while no
+# tracer is active a span only counts rows, so instrumented code costs nothing
+# extra in normal runs. Inside tracing(), every finished span is appended to
+# a JSON lines trace with wall and CPU time, rows processed, RSS (and, with
+# trace_memory, the tracemalloc allocation peak) and its status. A span that
+# exits with an exception is recorded as an error with its traceback before
+# the exception propagates. With profile_dir set, every stage span - the
+# children of a script's root span - also writes a cProfile .prof file.
+
+_MB = 1024 * 1024
+
+# Depth of the spans that get a cProfile capture (0 is the script's root span)
+PROFILE_DEPTH = 1
+
+_tracer = None
+
+def current_rss_mb():
+    """Resident set size of this process in MB (peak RSS where /proc is unavailable)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / _MB
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / _MB if sys.platform == 'darwin' else peak / 1024
+
+def _slug(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'span'
+
+class Span:
+    """One timed stage; count() adds to its rows-processed counter"""
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.rows = 0
+        self.error = None
+        self._alloc_peak = 0
+
+    def count(self, rows):
+        self.rows += int(rows)
+
+    def fail(self, error):
+        """Mark the span as failed without raising (for errors handled by the caller)"""
+        self.error = error
+
+class Tracer:
+    """Writes finished spans as JSON lines"""
+
+    def __init__(self, trace_path=None, profile_dir=None, trace_memory=False, profile_depth=PROFILE_DEPTH):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.trace_file = None
+        if trace_path:
+            os.makedirs(os.path.dirname(trace_path) or '.', exist_ok=True)
+            self.trace_file = open(trace_path, 'a')
+        self.profile_dir = profile_dir
+        self.profile_depth = profile_depth
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.stack = []
+        self.sequence = 0
+
+    def _memory_mark(self):
+        """Fold the tracemalloc peak so far into every open span, then reset it"""
+        current, peak = tracemalloc.get_traced_memory()
+        for open_span in self.stack:
+            open_span._alloc_peak = max(open_span._alloc_peak, peak)
+        tracemalloc.reset_peak()
+        return current
+
+    @contextmanager
+    def span(self, name, **attributes):
+        current = Span(name, attributes)
+        self.sequence += 1
+        sequence = self.sequence
+        parent = self.stack[-1].name if self.stack else None
+
+        profiler = None
+        if self.profile_dir and len(self.stack) == self.profile_depth:
+            profiler = cProfile.Profile()
+        if self.trace_memory:
+            alloc_start = self._memory_mark()
+        self.stack.append(current)
+        started_at = datetime.now().isoformat(timespec='milliseconds')
+        rss_start = current_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield current
+        except BaseException as error:
+            current.fail(error)
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            rss = current_rss_mb()
+            record = {
+                'run': self.run_id,
+                'seq': sequence,
+                'span': name,
+                'parent': parent,
+                'depth': len(self.stack) - 1,
+                'started_at': started_at,
+                'wall_s': round(wall, 6),
+                'cpu_s': round(cpu, 6),
+                'rows': current.rows,
+                'rows_per_sec': round(current.rows / wall, 1) if wall and current.rows else None,
+                'rss_mb': round(rss, 1),
+                'rss_delta_mb': round(rss - rss_start, 1)
+            }
+            if self.trace_memory:
+                self._memory_mark()
+                record['alloc_peak_mb'] = round((current._alloc_peak - alloc_start) / _MB, 1)
+            self.stack.pop()
+            if profiler is not None:
+                profile_path = os.path.join(self.profile_dir, f'{self.run_id}-{sequence:03d}-{_slug(name)}.prof')
+                profiler.dump_stats(profile_path)
+                record['profile'] = profile_path
+            record['status'] = 'ok' if current.error is None else 'error'
+            if current.error is not None:
+                record['error'] = f'{type(current.error).__name__}: {current.error}'
+                record['traceback'] = ''.join(traceback.format_exception(
+                    type(current.error), current.error, current.error.__traceback__
+                ))
+            record.update(current.attributes)
+            self.write(record)
+
+    def write(self, record):
+        if self.trace_file is not None:
+            self.trace_file.write(json.dumps(record, default=str) + '\n')
+            self.trace_file.flush()
+
+    def close(self):
+        if self.trace_file is not None:
+            self.trace_file.close()
+            self.trace_file = None
+        if self.trace_memory:
+            tracemalloc.stop()
+
+@contextmanager
+def span(name, **attributes):
+    """Time a stage under the active tracer; a bare row counter when tracing is off"""
+    if _tracer is None:
+        yield Span(name, attributes)
+        return
+    with _tracer.span(name, **attributes) as current:
+        yield current
+
+def traced(name=None):
+    """Decorator form of span(), named after the function by default"""
+    def decorate(function):
+        span_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+@contextmanager
+def tracing(trace_path=None, profile_dir=None, trace_memory=False):
+    """Activate a tracer for the duration of a with-block
+
+    With neither trace_path nor profile_dir set this does nothing, so CLI
+    entry points can wrap their work unconditionally. Allocation peaks are
+    only written to the trace file, so trace_memory requires trace_path.
+    """
+    global _tracer
+    if trace_memory and not trace_path:
+        raise ValueError("trace_memory needs a trace_path to record allocation peaks in")
+    if not trace_path and not profile_dir:
+        yield None
+        return
+    previous = _tracer
+    _tracer = Tracer(trace_path, profile_dir, trace_memory)
+    try:
+        yield _tracer
+    finally:
+        _tracer.close()
+        _tracer = previous
+
+def add_tracing_arguments(parser):
+    """--trace / --profile-dir / --trace-memory options for a script's CLI"""
+    parser.add_argument('--trace', help="append a JSON lines stage trace to this file")
+    parser.add_argument('--profile-dir', help="write a cProfile .prof file per top-level stage here")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="record tracemalloc allocation peaks per stage in the --trace file (slows the run)")
+
+def check_tracing_arguments(parser, args):
+    """Reject --trace-memory without a --trace file to write the peaks to"""
+    if args.trace_memory and not args.trace:
+        parser.error("--trace-memory needs --trace")
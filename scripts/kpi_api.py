@@ -0,0 +1,362 @@
+import argparse
+import asyncio
+import json
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from sql_statements import SQL_DIR, read_sql_statements, sql_file_path
+from db_meta import data_version
+from query_cache import DB_PATH, DEFAULT_CACHE_ENTRIES, QueryCache, statement_hash
+from parallel_sql_runner import DEFAULT_WORKERS, ConnectionPool, run_statement
+
+# Local JSON API over the TechGear Plus dashboard SQL.
+#
+# Every named statement in the KPI families below is served at
+# /kpi/<family>/<statement>, and a whole family at /kpi/<family>. Queries run
+# on a pool of read-only SQLite connections through a thread pool, so the
+# event loop never blocks on the database, and results go through the
+# versioned QueryCache. Concurrent identical requests are coalesced: the
+# first one starts the query and later ones await the same future. A full
+# reload is picked up by the next request: the pool reopens its connections
+# when load_sqlite.py replaces the database file, and the new data version
+# keys fresh cache entries.
+#
+# Filters are query parameters. Each filtered table is shadowed by a CTE of
+# the same name that selects only the matching rows, so the .sql files are
+# served unchanged and the indexes on the filter columns still apply. Date
+# ranges filter transactions by order_date and customers by
+# registration_date; a dimension filter applies to whichever table has that
+# column. Each statement reports the filters that actually affected it.
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8050
+
+# Statement files served as KPI families
+KPI_FAMILIES = ['kpi_calculations', 'product_performance', 'customer_analysis']
+
+# Executive summary statements run once at startup so the first dashboard
+# load is served from the cache
+WARM_STATEMENTS = [
+    ('kpi_calculations', 'Overall business KPIs'),
+    ('kpi_calculations', 'Complete executive summary for dashboard'),
+    ('kpi_calculations', 'Monthly revenue trends'),
+    ('kpi_calculations', 'Channel revenue analysis'),
+    ('kpi_calculations', 'Regional sales breakdown'),
+    ('product_performance', 'Category revenue breakdown with full metrics')
+]
+
+# table -> (date column for start_date/end_date, dimension filter columns)
+TABLE_FILTERS = {
+    'techgear_transactions': ('order_date', ['sales_channel', 'region', 'product_category', 'customer_type']),
+    'techgear_customers': ('registration_date', ['customer_segment', 'acquisition_channel'])
+}
+
+DATE_FILTERS = ['start_date', 'end_date']
+DIMENSION_FILTERS = [column for _, columns in TABLE_FILTERS.values() for column in columns]
+
+# Largest request head accepted (request line plus headers)
+MAX_HEADER_BYTES = 16384
+
+class RequestError(Exception):
+    """A request the API rejects, with the HTTP status to answer with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def statement_slug(name):
+    """URL path segment for a statement name, e.g. 'overall-business-kpis'"""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+def load_families(sql_dir=SQL_DIR, families=KPI_FAMILIES):
+    """{family: {slug: (name, sql)}} for every statement in the family files"""
+    return OrderedDict(
+        (family, OrderedDict(
+            (statement_slug(statement['name']), (statement['name'], statement['sql']))
+            for statement in read_sql_statements(sql_file_path(family, sql_dir))
+        ))
+        for family in families
+    )
+
+def parse_filters(query):
+    """Validated filters from a URL query string
+
+    Dates must be YYYY-MM-DD; dimension values may be repeated or comma
+    separated. Returns {'start_date': str, ..., 'region': [values], ...}.
+    """
+    filters = {}
+    for key, values in parse_qs(query, keep_blank_values=True).items():
+        if key in DATE_FILTERS:
+            try:
+                filters[key] = datetime.strptime(values[-1], '%Y-%m-%d').strftime('%Y-%m-%d')
+            except ValueError:
+                raise RequestError(HTTPStatus.BAD_REQUEST, f"{key} must be a date (YYYY-MM-DD), got {values[-1]!r}")
+        elif key in DIMENSION_FILTERS:
+            filters[key] = sorted({item.strip() for value in values for item in value.split(',') if item.strip()})
+        else:
+            raise RequestError(HTTPStatus.BAD_REQUEST,
+                               f"Unknown filter {key!r} (use {', '.join(DATE_FILTERS + DIMENSION_FILTERS)})")
+    if filters.get('start_date') and filters.get('end_date') and filters['start_date'] > filters['end_date']:
+        raise RequestError(HTTPStatus.BAD_REQUEST, "start_date is after end_date")
+    return filters
+
+def filtered_statement(sql, filters):
+    """Rewrite a statement so each table it reads sees only the filtered rows
+
+    Returns (sql, params, applied filter names). Without applicable filters
+    the statement is returned unchanged, so it shares cache entries with the
+    unfiltered dashboard queries.
+    """
+    ctes = []
+    params = {}
+    applied = []
+    for table, (date_column, dimensions) in TABLE_FILTERS.items():
+        if not re.search(rf'\b{table}\b', sql):
+            continue
+        conditions = []
+        if filters.get('start_date'):
+            conditions.append(f"{date_column} >= :start_date")
+            params['start_date'] = filters['start_date']
+            applied.append('start_date')
+        if filters.get('end_date'):
+            conditions.append(f"{date_column} < date(:end_date, '+1 day')")
+            params['end_date'] = filters['end_date']
+            applied.append('end_date')
+        for column in dimensions:
+            if not filters.get(column):
+                continue
+            names = [f'{column}_{i}' for i in range(len(filters[column]))]
+            conditions.append(f"{column} IN ({', '.join(':' + name for name in names)})")
+            params.update(zip(names, filters[column]))
+            applied.append(column)
+        if conditions:
+            # On the right of a LEFT JOIN an inlined filter would be probed once
+            # per outer row; materializing lets SQLite index the filtered rows
+            left_joined = re.search(rf'LEFT\s+(OUTER\s+)?JOIN\s+{table}\b', sql, re.IGNORECASE)
+            materialized = 'MATERIALIZED' if left_joined else 'NOT MATERIALIZED'
+            # main.<table> is the real table; the unqualified name now means the CTE
+            ctes.append(f"{table} AS {materialized} (\n    SELECT * FROM main.{table}\n"
+                        f"    WHERE {' AND '.join(conditions)}\n)")
+    if not ctes:
+        return sql, {}, []
+
+    existing_with = re.match(r'\s*WITH\s', sql, re.IGNORECASE)
+    if existing_with:
+        sql = 'WITH ' + ',\n'.join(ctes) + ',\n' + sql[existing_with.end():]
+    else:
+        sql = 'WITH ' + ',\n'.join(ctes) + '\n' + sql
+    return sql, params, sorted(set(applied))
+
+class KPIService:
+    """KPI endpoints over a SQLite database, with request coalescing"""
+
+    def __init__(self, db_path=DB_PATH, workers=DEFAULT_WORKERS, sql_dir=SQL_DIR, cache=None):
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path, workers)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='kpi-db')
+        self.cache = cache if cache is not None else QueryCache()
+        self.families = load_families(sql_dir)
+        # statement hash -> future of the query currently running for it
+        self.in_flight = {}
+        self.requests = 0
+        self.queries = 0
+        self.coalesced = 0
+
+    async def run(self, sql, params=None):
+        """Run a statement on the worker pool, joining an identical one in flight"""
+        key = statement_hash(sql, params)
+        future = self.in_flight.get(key)
+        coalesced = future is not None
+        if coalesced:
+            self.coalesced += 1
+        else:
+            self.queries += 1
+            future = asyncio.get_running_loop().run_in_executor(
+                self.executor, run_statement, self.pool, sql, self.cache, params
+            )
+            self.in_flight[key] = future
+            future.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        # shield: a client disconnecting must not cancel a query others await
+        result = await asyncio.shield(future)
+        return dict(result, coalesced=coalesced)
+
+    async def statement(self, family, slug, filters):
+        """One named statement as a JSON-ready dict"""
+        name, sql = self.families[family][slug]
+        sql, params, applied = filtered_statement(sql, filters)
+        result = await self.run(sql, params)
+        return {
+            'family': family,
+            'statement': slug,
+            'name': name,
+            'filters': applied,
+            'columns': result['columns'],
+            'rows': result['rows'],
+            'elapsed_ms': round(result['elapsed_ms'], 3),
+            'cached': result['cached'],
+            'coalesced': result['coalesced']
+        }
+
+    async def family(self, family, filters):
+        """Every statement of a family, run concurrently"""
+        statements = await asyncio.gather(*(
+            self.statement(family, slug, filters) for slug in self.families[family]
+        ))
+        return {'family': family, 'statements': statements}
+
+    async def prewarm(self, statements=WARM_STATEMENTS):
+        """Run the executive summary statements to fill the cache
+
+        Returns the number of statements and the wall time in seconds.
+        """
+        start = time.perf_counter()
+        slugs = [(family, statement_slug(name)) for family, name in statements]
+        await asyncio.gather(*(self.statement(family, slug, {}) for family, slug in slugs))
+        return len(slugs), time.perf_counter() - start
+
+    def _data_version(self):
+        with self.pool.connection() as conn:
+            version = data_version(conn)
+        return {'load_id': version[0], 'data_generation': version[1], 'max_rowid': version[2]}
+
+    async def stats(self):
+        """Cache, coalescing and data version counters"""
+        version = await asyncio.get_running_loop().run_in_executor(self.executor, self._data_version)
+        return {
+            'data_version': version,
+            'requests': self.requests,
+            'queries': self.queries,
+            'coalesced': self.coalesced,
+            'in_flight': len(self.in_flight),
+            'cache': self.cache.stats()
+        }
+
+    def index(self):
+        """Families, their statement endpoints and the accepted filters"""
+        return {
+            'families': {
+                family: [{'statement': slug, 'name': name, 'path': f'/kpi/{family}/{slug}'}
+                         for slug, (name, _) in statements.items()]
+                for family, statements in self.families.items()
+            },
+            'filters': {
+                'dates': DATE_FILTERS,
+                'dimensions': {table: columns for table, (_, columns) in TABLE_FILTERS.items()}
+            }
+        }
+
+    async def dispatch(self, method, target):
+        """Route one request to (status, payload)"""
+        if method != 'GET':
+            raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed (GET only)")
+        url = urlsplit(target)
+        parts = [part for part in url.path.split('/') if part]
+        if parts == ['health']:
+            return HTTPStatus.OK, {'status': 'ok'}
+        if parts == ['stats']:
+            return HTTPStatus.OK, await self.stats()
+        if parts == ['kpi'] or not parts:
+            return HTTPStatus.OK, self.index()
+        if parts[0] == 'kpi' and len(parts) in (2, 3):
+            family = parts[1]
+            if family not in self.families:
+                raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown KPI family {family!r}")
+            filters = parse_filters(url.query)
+            if len(parts) == 2:
+                return HTTPStatus.OK, await self.family(family, filters)
+            if parts[2] not in self.families[family]:
+                raise RequestError(HTTPStatus.NOT_FOUND, f"Unknown statement {parts[2]!r} in {family}")
+            return HTTPStatus.OK, await self.statement(family, parts[2], filters)
+        raise RequestError(HTTPStatus.NOT_FOUND, f"No endpoint at {url.path}")
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection (keep-alive aware)"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        key, value = line.split(':', 1)
+                        headers[key.strip().lower()] = value.strip()
+                # Request bodies are not used; skip one if sent
+                body_length = headers.get('content-length', '0')
+                if body_length.isdigit() and int(body_length):
+                    await reader.readexactly(int(body_length))
+
+                self.requests += 1
+                request_line = lines[0].split(' ')
+                keep_alive = False
+                try:
+                    if len(request_line) != 3:
+                        raise RequestError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+                    method, target, version = request_line
+                    keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                    status, payload = await self.dispatch(method, target)
+                except RequestError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f'{type(e).__name__}: {e}'}
+
+                body = json.dumps(payload, default=str).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.pool.close()
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT, prewarm=True):
+    """Pre-warm the cache, then serve until cancelled"""
+    if prewarm:
+        count, seconds = await service.prewarm()
+        print(f"✓ Pre-warmed {count} executive summary queries in {seconds:.2f}s")
+    server = await asyncio.start_server(service.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+    print(f"✓ Serving KPIs from {service.db_path} on http://{host}:{port}/kpi")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    """Serve the dashboard KPIs as JSON over HTTP"""
+    parser = argparse.ArgumentParser(description="Local JSON API for the TechGear Plus KPIs")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite database file")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="interface to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port to listen on")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="pooled connections / query threads")
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_CACHE_ENTRIES, help="query cache size bound")
+    parser.add_argument('--no-prewarm', action='store_true', help="skip running the executive summary at startup")
+    args = parser.parse_args()
+
+    print("Starting TechGear Plus KPI API...")
+    print("=" * 50)
+
+    service = KPIService(args.db, args.workers, cache=QueryCache(args.max_entries))
+    try:
+        asyncio.run(serve(service, args.host, args.port, prewarm=not args.no_prewarm))
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        service.close()
+
+if __name__ == "__main__":
+    main()
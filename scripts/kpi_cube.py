@@ -0,0 +1,324 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from techgear_io import RAW_DATA_DIR, parse_ids, read_table, table_date_range
+
+# In-process KPI engine for the embedded dashboard service.
+#
+# Transactions are loaded once into integer-coded arrays (one code array per
+# dimension, money in integer cents) and every KPI family from the SQL files is
+# answered with np.bincount over those codes. Results are cached per query, so
+# after warm() each call is a dictionary lookup. Numbers are returned unformatted
+# but rounded the way the SQL presents them (money to cents, shares and margins
+# to one decimal), and rows come back in the SQL ORDER BY order.
+
+TRANSACTION_COLUMNS = [
+    'customer_id', 'order_date', 'product_category', 'product_name', 'product_id',
+    'quantity', 'unit_price', 'total_amount', 'sales_channel', 'region', 'customer_type'
+]
+
+MONTH_NAMES = [
+    'January', 'February', 'March', 'April', 'May', 'June', 'July',
+    'August', 'September', 'October', 'November', 'December'
+]
+
+# Dimension -> SQL column name used in the query output
+DIMENSION_COLUMNS = {
+    'product_category': 'product_category',
+    'sales_channel': 'sales_channel',
+    'region': 'region',
+    'customer_type': 'customer_type',
+    'year': 'year',
+    'month': 'month',
+    'month_of_year': 'month_num'
+}
+
+# Dimensions the SQL reports chronologically; the rest are ordered by revenue
+CHRONOLOGICAL_DIMENSIONS = {'year', 'month'}
+
+def _encode(values):
+    """Integer codes and labels for a categorical or string column"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy().astype(np.int64), list(values.cat.categories)
+    codes, labels = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), list(labels)
+
+def _to_cents(values):
+    """Money column as exact integer cents"""
+    return np.rint(np.asarray(values, dtype=np.float64) * 100).astype(np.int64)
+
+def _money(cents):
+    """Integer cents back to a dollar amount"""
+    return round(float(cents) / 100, 2)
+
+class KpiCube:
+    """Grouped KPI aggregates over integer-coded transaction arrays"""
+
+    def __init__(self, transactions_df, products_df):
+        self.rows = len(transactions_df)
+        self._cache = {}
+
+        self.revenue_cents = _to_cents(transactions_df['total_amount'])
+        self.unit_price_cents = _to_cents(transactions_df['unit_price'])
+        self.quantity = transactions_df['quantity'].to_numpy().astype(np.int64)
+        self.customer = parse_ids(transactions_df['customer_id'], 'customer_id').astype(np.int64)
+
+        order_days = transactions_df['order_date'].to_numpy().astype('datetime64[D]')
+        self.first_date = str(order_days.min()) if self.rows else None
+        self.last_date = str(order_days.max()) if self.rows else None
+
+        self.dimensions = {}
+        for column in ('product_category', 'sales_channel', 'region', 'customer_type'):
+            self.dimensions[column] = _encode(transactions_df[column])
+
+        months = order_days.astype('datetime64[M]')
+        month_codes, month_labels = np.unique(months, return_inverse=True)
+        self.dimensions['month'] = (
+            month_labels.astype(np.int64), [str(m) for m in month_codes]
+        )
+        years = order_days.astype('datetime64[Y]')
+        year_codes, year_labels = np.unique(years, return_inverse=True)
+        self.dimensions['year'] = (year_labels.astype(np.int64), [str(y) for y in year_codes])
+        month_of_year = (months.astype(np.int64) % 12).astype(np.int64)
+        self.dimensions['month_of_year'] = (month_of_year, [f'{m:02d}' for m in range(1, 13)])
+
+        # Product join: transaction row -> position in the products table
+        self.products = products_df.reset_index(drop=True)
+        product_numbers = parse_ids(self.products['product_id'], 'product_id').astype(np.int64)
+        transaction_products = parse_ids(transactions_df['product_id'], 'product_id').astype(np.int64)
+        lookup = np.full(max(product_numbers.max(initial=-1), transaction_products.max(initial=-1)) + 1, -1,
+                         dtype=np.int64)
+        lookup[product_numbers] = np.arange(len(product_numbers))
+        self.product_index = lookup[transaction_products]
+        self.product_category_codes, self.product_categories = _encode(self.products['category'])
+
+        # SQL groups top products by (product_name, product_category)
+        name_codes, name_labels = _encode(transactions_df['product_name'])
+        category_codes, category_labels = self.dimensions['product_category']
+        pair_keys = name_codes * len(category_labels) + category_codes
+        pair_values, pair_codes = np.unique(pair_keys, return_inverse=True)
+        self.dimensions['product'] = (
+            pair_codes.astype(np.int64),
+            [(name_labels[k // len(category_labels)], category_labels[k % len(category_labels)])
+             for k in pair_values]
+        )
+
+    @classmethod
+    def load(cls, raw_dir=RAW_DATA_DIR, start_date=None, end_date=None):
+        """Load the cube from the raw data folder (columnar bundle preferred)
+
+        start_date/end_date restrict the cube to a date window; with month
+        partitions only the partitions in the window are read.
+        """
+        transactions = read_table('techgear_transactions', raw_dir, TRANSACTION_COLUMNS, decode_ids=False,
+                                  start_date=start_date, end_date=end_date)
+        products = read_table('techgear_products', raw_dir, decode_ids=False)
+        return cls(transactions, products)
+
+    def _cached(self, key, compute):
+        """Return a cached query result, computing it on first use"""
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _group_sums(self, dimension):
+        """Per-group order count, revenue cents, units and unit price cents"""
+        def compute():
+            codes, labels = self.dimensions[dimension]
+            size = len(labels)
+            return {
+                'orders': np.bincount(codes, minlength=size),
+                'revenue_cents': np.bincount(codes, weights=self.revenue_cents, minlength=size).astype(np.int64),
+                'units': np.bincount(codes, weights=self.quantity, minlength=size).astype(np.int64),
+                'unit_price_cents': np.bincount(codes, weights=self.unit_price_cents, minlength=size).astype(np.int64)
+            }
+        return self._cached(('sums', dimension), compute)
+
+    def _distinct_customers(self, dimension):
+        """Exact COUNT(DISTINCT customer_id) per group"""
+        def compute():
+            codes, labels = self.dimensions[dimension]
+            stride = int(self.customer.max(initial=0)) + 1
+            keys = np.unique(codes * stride + self.customer)
+            return np.bincount(keys // stride, minlength=len(labels))
+        return self._cached(('distinct', dimension), compute)
+
+    def _revenue_order(self, sums):
+        """Group order matching ORDER BY SUM(total_amount) DESC"""
+        return np.argsort(-sums['revenue_cents'], kind='stable')
+
+    def revenue_by(self, dimension):
+        """Orders, revenue, share, AOV, units and unique customers per dimension value
+
+        Covers the category, channel, region, year, monthly and seasonal
+        breakdowns in kpi_calculations.sql and product_performance.sql.
+        """
+        def compute():
+            codes, labels = self.dimensions[dimension]
+            sums = self._group_sums(dimension)
+            customers = self._distinct_customers(dimension)
+            total_cents = int(sums['revenue_cents'].sum())
+            order = range(len(labels)) if dimension in CHRONOLOGICAL_DIMENSIONS else self._revenue_order(sums)
+
+            rows = []
+            for group in order:
+                orders = int(sums['orders'][group])
+                if orders == 0:
+                    continue
+                revenue_cents = int(sums['revenue_cents'][group])
+                row = {
+                    DIMENSION_COLUMNS[dimension]: labels[group],
+                    'total_orders': orders,
+                    'total_revenue': _money(revenue_cents),
+                    'revenue_share': round(revenue_cents * 100.0 / total_cents, 1),
+                    'avg_order_value': round(revenue_cents / 100 / orders, 2),
+                    'units_sold': int(sums['units'][group]),
+                    'unique_customers': int(customers[group])
+                }
+                if dimension == 'month_of_year':
+                    row['month_name'] = MONTH_NAMES[group]
+                rows.append(row)
+            return rows
+        return self._cached(('revenue_by', dimension), compute)
+
+    def yoy_growth(self):
+        """Yearly revenue with year-over-year growth percentage"""
+        def compute():
+            rows = []
+            previous = None
+            for year_row in self.revenue_by('year'):
+                revenue = year_row['total_revenue']
+                growth = None if previous is None else round((revenue - previous) / previous * 100, 1)
+                rows.append({'year': year_row['year'], 'revenue': revenue, 'yoy_growth': growth})
+                previous = revenue
+            return rows
+        return self._cached('yoy_growth', compute)
+
+    def executive_summary(self):
+        """The Tableau-ready executive summary row"""
+        def compute():
+            total_cents = int(self.revenue_cents.sum())
+            return {
+                'total_transactions': self.rows,
+                'active_customers': int(len(np.unique(self.customer))),
+                'total_products': len(self.products),
+                'total_revenue': _money(total_cents),
+                'avg_order_value': round(total_cents / 100 / self.rows, 2) if self.rows else None,
+                'first_order_date': self.first_date,
+                'last_order_date': self.last_date
+            }
+        return self._cached('executive_summary', compute)
+
+    def top_products(self, by='revenue', limit=10):
+        """Top products by revenue or by units sold"""
+        def compute():
+            codes, labels = self.dimensions['product']
+            sums = self._group_sums('product')
+            ranking = sums['revenue_cents'] if by == 'revenue' else sums['units']
+            order = np.argsort(-ranking, kind='stable')[:limit]
+            rows = []
+            for group in order:
+                orders = int(sums['orders'][group])
+                rows.append({
+                    'product_name': labels[group][0],
+                    'product_category': labels[group][1],
+                    'total_orders': orders,
+                    'total_revenue': _money(sums['revenue_cents'][group]),
+                    'avg_price': round(int(sums['unit_price_cents'][group]) / 100 / orders, 2),
+                    'total_units_sold': int(sums['units'][group])
+                })
+            return rows
+        return self._cached(('top_products', by, limit), compute)
+
+    def category_margins(self):
+        """Category performance joined to the product catalog's prices and margins"""
+        def compute():
+            matched = self.product_index >= 0
+            product_rows = self.product_index[matched]
+            num_products = len(self.products)
+
+            # Aggregate per product once, then roll products up to categories
+            product_orders = np.bincount(product_rows, minlength=num_products)
+            product_revenue = np.bincount(product_rows, weights=self.revenue_cents[matched], minlength=num_products)
+            product_unit_price = np.bincount(product_rows, weights=self.unit_price_cents[matched], minlength=num_products)
+
+            retail = self.products['retail_price'].to_numpy(dtype=np.float64)
+            cost = self.products['cost_price'].to_numpy(dtype=np.float64)
+            margin = (retail - cost) / retail * 100
+
+            categories = self.product_category_codes
+            size = len(self.product_categories)
+            orders = np.bincount(categories, weights=product_orders, minlength=size)
+            revenue_cents = np.bincount(categories, weights=product_revenue, minlength=size)
+            unit_price_cents = np.bincount(categories, weights=product_unit_price, minlength=size)
+            retail_sum = np.bincount(categories, weights=product_orders * retail, minlength=size)
+            cost_sum = np.bincount(categories, weights=product_orders * cost, minlength=size)
+            margin_sum = np.bincount(categories, weights=product_orders * margin, minlength=size)
+
+            rows = []
+            for group in np.argsort(-revenue_cents, kind='stable'):
+                count = int(orders[group])
+                if count == 0:
+                    continue
+                rows.append({
+                    'category': self.product_categories[group],
+                    'total_orders': count,
+                    'total_revenue': _money(revenue_cents[group]),
+                    'avg_selling_price': round(float(unit_price_cents[group]) / 100 / count, 2),
+                    'avg_retail_price': round(float(retail_sum[group]) / count, 2),
+                    'avg_cost_price': round(float(cost_sum[group]) / count, 2),
+                    'avg_margin_percent': round(float(margin_sum[group]) / count, 1)
+                })
+            return rows
+        return self._cached('category_margins', compute)
+
+    def warm(self):
+        """Precompute every KPI family so later calls are cache hits"""
+        for dimension in DIMENSION_COLUMNS:
+            self.revenue_by(dimension)
+        self.yoy_growth()
+        self.executive_summary()
+        self.top_products('revenue')
+        self.top_products('units')
+        self.category_margins()
+
+def main():
+    """Load the cube, warm it and report per-query latency"""
+    parser = argparse.ArgumentParser(description="In-process TechGear Plus KPI cube")
+    parser.add_argument('--raw-dir', default=RAW_DATA_DIR, help="directory with the generated data files")
+    parser.add_argument('--start-date', help="first order date to include (YYYY-MM-DD)")
+    parser.add_argument('--end-date', help="last order date to include (YYYY-MM-DD)")
+    parser.add_argument('--last-days', type=int, help="only the last N days of orders")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    start_date, end_date = args.start_date, args.end_date
+    if args.last_days:
+        _, end_date = table_date_range('techgear_transactions', args.raw_dir)
+        start_date = end_date - np.timedelta64(args.last_days - 1, 'D')
+    cube = KpiCube.load(args.raw_dir, start_date, end_date)
+    loaded = time.perf_counter()
+    cube.warm()
+    warmed = time.perf_counter()
+
+    print(f"Loaded {cube.rows:,} transactions in {loaded - start:.2f}s, warmed in {warmed - loaded:.2f}s")
+    print(cube.executive_summary())
+
+    queries = {
+        f'revenue_by({dimension})': (lambda d=dimension: cube.revenue_by(d)) for dimension in DIMENSION_COLUMNS
+    }
+    queries['yoy_growth()'] = cube.yoy_growth
+    queries['top_products(revenue)'] = lambda: cube.top_products('revenue')
+    queries['top_products(units)'] = lambda: cube.top_products('units')
+    queries['category_margins()'] = cube.category_margins
+
+    for name, query in queries.items():
+        start = time.perf_counter()
+        query()
+        print(f"  {name}: {(time.perf_counter() - start) * 1e6:.1f} µs")
+
+if __name__ == "__main__":
+    main()
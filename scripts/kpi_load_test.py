@@ -0,0 +1,144 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from kpi_api import DEFAULT_HOST, DEFAULT_PORT
+
+# Load test for kpi_api.py.
+#
+# Opens --concurrency keep-alive connections and has each one issue requests
+# back to back, cycling through the request paths, until --requests have
+# completed. Reports throughput and latency percentiles; warm-up requests
+# are sent first and not measured.
+
+DEFAULT_PATHS = [
+    '/kpi/kpi_calculations/overall-business-kpis',
+    '/kpi/kpi_calculations/complete-executive-summary-for-dashboard',
+    '/kpi/kpi_calculations/monthly-revenue-trends',
+    '/kpi/kpi_calculations/channel-revenue-analysis?start_date=2024-01-01&end_date=2024-12-31',
+    '/kpi/product_performance/category-revenue-breakdown-with-full-metrics?region=Northeast',
+    '/kpi/customer_analysis'
+]
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_REQUESTS = 2000
+
+async def fetch(reader, writer, host, path):
+    """Send one GET on an open connection and read the response
+
+    Returns (status, body bytes, keep_alive).
+    """
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            key, value = line.split(':', 1)
+            headers[key.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, body, headers.get('connection', '').lower() != 'close'
+
+async def client(host, port, paths, next_request, total, latencies, errors):
+    """One connection issuing requests until the shared counter reaches total"""
+    reader = writer = None
+    try:
+        while next_request[0] < total:
+            index = next_request[0]
+            next_request[0] += 1
+            path = paths[index % len(paths)]
+            start = time.perf_counter()
+            try:
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+                status, body, keep_alive = await fetch(reader, writer, host, path)
+            except (OSError, asyncio.IncompleteReadError) as e:
+                errors.append(f'{path}: {type(e).__name__}: {e}')
+                if writer is not None:
+                    writer.close()
+                reader = writer = None
+                continue
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(f"{path}: HTTP {status} {json.loads(body).get('error', '')}")
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+async def run_load(host, port, paths, concurrency, total):
+    """Run total requests over concurrency connections
+
+    Returns (latencies in seconds, error messages, wall seconds).
+    """
+    latencies = []
+    errors = []
+    next_request = [0]
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, paths, next_request, total, latencies, errors) for _ in range(concurrency)
+    ))
+    return latencies, errors, time.perf_counter() - start
+
+def latency_report(latencies, errors, wall_seconds):
+    """Throughput and p50/p90/p99/max latency in milliseconds"""
+    latencies_ms = np.asarray(latencies) * 1000
+    report = {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'wall_s': wall_seconds,
+        'requests_per_sec': len(latencies) / wall_seconds if wall_seconds else 0.0
+    }
+    for label, q in (('p50_ms', 50), ('p90_ms', 90), ('p99_ms', 99), ('max_ms', 100)):
+        report[label] = float(np.percentile(latencies_ms, q)) if len(latencies_ms) else None
+    return report
+
+def main():
+    """Load test the KPI API and report latency percentiles and throughput"""
+    parser = argparse.ArgumentParser(description="Load test the TechGear Plus KPI API")
+    parser.add_argument('--url', default=f'http://{DEFAULT_HOST}:{DEFAULT_PORT}', help="base URL of kpi_api.py")
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help="request paths to cycle through")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="concurrent connections")
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help="measured requests")
+    parser.add_argument('--warmup', type=int, default=None, help="unmeasured requests first (default: one per path)")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    host, port = url.hostname or DEFAULT_HOST, url.port or DEFAULT_PORT
+    warmup = len(args.paths) if args.warmup is None else args.warmup
+
+    if warmup:
+        asyncio.run(run_load(host, port, args.paths, min(args.concurrency, warmup), warmup))
+    latencies, errors, wall_seconds = asyncio.run(
+        run_load(host, port, args.paths, args.concurrency, args.requests)
+    )
+    report = dict(latency_report(latencies, errors, wall_seconds), concurrency=args.concurrency)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("TechGear Plus KPI API Load Test")
+        print("=" * 50)
+        print(f"  Target: {args.url} ({len(args.paths)} paths, {args.concurrency} connections)")
+        print(f"  Requests: {report['requests']:,} in {wall_seconds:.2f}s ({report['errors']} errors)")
+        print(f"  Throughput: {report['requests_per_sec']:,.1f} requests/sec")
+        if latencies:
+            print(f"  Latency: p50 {report['p50_ms']:.2f} ms, p90 {report['p90_ms']:.2f} ms, "
+                  f"p99 {report['p99_ms']:.2f} ms, max {report['max_ms']:.2f} ms")
+        for error in errors[:5]:
+            print(f"  ❌ {error}")
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
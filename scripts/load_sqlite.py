@@ -0,0 +1,310 @@
+import argparse
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from techgear_io import RAW_DATA_DIR, TABLE_SCHEMAS, PARTITION_COLUMNS, iter_table_chunks
+from sql_statements import SQL_DIR, read_sql_statements, sql_file_path
+from refresh_rollups import (init_rollup_build, accumulate_rollup_build, write_rollup_build, refresh_rollups,
+                             sketch_precision)
+from hll import DEFAULT_PRECISION
+from db_meta import bump_data_generation, read_data_generation
+
+# Bulk loader for the TechGear Plus SQLite database.
+#
+# Load time is bounded by two single-threaded costs: binding rows through
+# sqlite3's executemany (about 160k rows/sec per core) and sorting the seven
+# transaction indexes (about 8 s per million rows). The sub-minute target
+# therefore holds up to about 2M transactions on one core (27.5 s measured,
+# rollups excluded); 10M take about 2.5 minutes on one core (147 s: 63 s
+# inserting, 84 s indexing) and are not expected to load in under a minute.
+
+DB_PATH = '../data/techgear.db'
+
+# Rows per executemany batch; each batch is one chunk read from disk
+LOAD_BATCH_ROWS = 200000
+
+# Bulk-load pragmas. The database is built in a temporary file and renamed
+# into place once complete, so crash safety during the load is not needed.
+LOAD_PRAGMAS = [
+    'PRAGMA journal_mode = OFF',
+    'PRAGMA synchronous = OFF',
+    'PRAGMA cache_size = -262144',  # 256 MB page cache
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA mmap_size = 4294967296',  # index builds scan the table through the OS page cache
+    'PRAGMA locking_mode = EXCLUSIVE',
+    'PRAGMA threads = 4',  # helper threads for the index sorter
+    'PRAGMA analysis_limit = 1000'  # sample indexes during ANALYZE
+]
+
+def schema_statements(sql_dir=SQL_DIR):
+    """Split schema.sql into its CREATE TABLE and CREATE INDEX statements"""
+    statements = read_sql_statements(sql_file_path('schema', sql_dir))
+    tables = [s['sql'] for s in statements if s['sql'].upper().startswith('CREATE TABLE')]
+    indexes = [s['sql'] for s in statements if s['sql'].upper().startswith(('CREATE INDEX', 'CREATE UNIQUE INDEX'))]
+    return tables, indexes
+
+def date_strings(values):
+    """ISO 'YYYY-MM-DD' text for a datetime column, None for missing dates"""
+    days = values.to_numpy().astype('datetime64[D]')
+    missing = np.isnat(days)
+    if missing.all():
+        return [None] * len(days)
+
+    # Format each distinct day once through a lookup table
+    day_numbers = days.astype(np.int64)
+    first_day = day_numbers[~missing].min()
+    last_day = day_numbers[~missing].max()
+    lookup = np.arange(first_day, last_day + 1).astype('datetime64[D]').astype(str).astype(object)
+    text = lookup[np.clip(day_numbers - first_day, 0, last_day - first_day)]
+    text[missing] = None
+    return text.tolist()
+
+def chunk_to_rows(chunk):
+    """Convert a DataFrame chunk into SQLite-ready row tuples
+
+    Dates become ISO 'YYYY-MM-DD' text and missing values become NULL.
+    """
+    columns = []
+    for column in chunk.columns:
+        values = chunk[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            columns.append(date_strings(values))
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            lookup = np.append(values.cat.categories.to_numpy(dtype=object), None)
+            columns.append(lookup[values.cat.codes.to_numpy()].tolist())
+        elif pd.api.types.is_float_dtype(values) or pd.api.types.is_integer_dtype(values):
+            columns.append(values.to_numpy().tolist())
+        else:
+            text = values.to_numpy(dtype=object)
+            text[pd.isna(text)] = None
+            columns.append(text.tolist())
+    return list(zip(*columns))
+
+def iter_table_rows(table, raw_dir=RAW_DATA_DIR, batch_size=LOAD_BATCH_ROWS, start_date=None, end_date=None):
+    """Yield (chunk, row tuples) batches for a table in schema column order
+
+    A date range applies to the partitioned transaction table only.
+    """
+    columns = list(TABLE_SCHEMAS[table])
+    if table not in PARTITION_COLUMNS:
+        start_date = end_date = None
+    for chunk in iter_table_chunks(table, raw_dir, batch_size, columns,
+                                   start_date=start_date, end_date=end_date):
+        chunk = chunk[columns]
+        yield chunk, chunk_to_rows(chunk)
+
+def load_table(conn, table, raw_dir=RAW_DATA_DIR, batch_size=LOAD_BATCH_ROWS, start_date=None, end_date=None,
+               on_chunk=None):
+    """Bulk-insert one table from its CSV, columnar bundle or month partitions
+
+    on_chunk, if given, is called with each inserted DataFrame chunk.
+    """
+    columns = list(TABLE_SCHEMAS[table])
+    insert_sql = (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})"
+    )
+
+    # Read and convert the next batch on a helper thread while SQLite inserts
+    # the current one (sqlite3 releases the GIL while stepping statements)
+    rows = 0
+    batches = iter_table_rows(table, raw_dir, batch_size, start_date, end_date)
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        pending = reader.submit(next, batches, None)
+        while True:
+            batch = pending.result()
+            if batch is None:
+                break
+            pending = reader.submit(next, batches, None)
+            chunk, batch_rows = batch
+            conn.executemany(insert_sql, batch_rows)
+            if on_chunk is not None:
+                on_chunk(chunk)
+            rows += len(batch_rows)
+    return rows
+
+def load_techgear_database(db_path=DB_PATH, raw_dir=RAW_DATA_DIR, batch_size=LOAD_BATCH_ROWS,
+                           start_date=None, end_date=None, hll_precision=DEFAULT_PRECISION):
+    """Build the SQLite database from the raw data files
+
+    Returns a dict of table -> {'rows', 'seconds', 'rows_per_sec'}, plus
+    'indexes' (index creation and ANALYZE), 'load' (everything except the
+    rollups) and 'rollups' timings. The daily rollups and customer sketches
+    are aggregated in numpy from the transaction chunks as they are inserted,
+    instead of a GROUP BY over the loaded table; that work is timed under
+    'rollups' and left out of the table and load timings. start_date/end_date
+    load only that window of transactions, reading just the overlapping month
+    partitions. hll_precision sets the size of the daily customer sketches.
+    """
+    tmp_path = db_path + '.loading'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    table_sql, index_sql = schema_statements()
+    previous_generation = read_data_generation(db_path) if os.path.exists(db_path) else 0
+    build = init_rollup_build(hll_precision)
+    rollup_seconds = 0.0
+    stats = {}
+
+    def accumulate_rollups(chunk):
+        nonlocal rollup_seconds
+        start = time.perf_counter()
+        accumulate_rollup_build(build, chunk)
+        rollup_seconds += time.perf_counter() - start
+
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    try:
+        for pragma in LOAD_PRAGMAS:
+            conn.execute(pragma)
+
+        conn.execute('BEGIN')
+        for statement in table_sql:
+            conn.execute(statement)
+
+        for table in TABLE_SCHEMAS:
+            start = time.perf_counter()
+            rollups_before = rollup_seconds
+            on_chunk = accumulate_rollups if table == 'techgear_transactions' else None
+            rows = load_table(conn, table, raw_dir, batch_size, start_date, end_date, on_chunk)
+            seconds = time.perf_counter() - start - (rollup_seconds - rollups_before)
+            stats[table] = {'rows': rows, 'seconds': seconds, 'rows_per_sec': rows / seconds if seconds else 0.0}
+
+        conn.execute('COMMIT')
+
+        # Indexes are cheaper to build once after the load than to maintain per insert
+        start = time.perf_counter()
+        for statement in index_sql:
+            conn.execute(statement)
+        index_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        conn.execute('BEGIN')
+        write_rollup_build(conn, build)
+        rollup_seconds += time.perf_counter() - start
+        bump_data_generation(conn, new_load=True, previous_generation=previous_generation)
+        conn.execute('COMMIT')
+
+        start = time.perf_counter()
+        conn.execute('ANALYZE')
+        stats['indexes'] = {'seconds': index_seconds + time.perf_counter() - start}
+        stats['rollups'] = {'seconds': rollup_seconds}
+        stats['load'] = {
+            'seconds': sum(stats[table]['seconds'] for table in TABLE_SCHEMAS) + stats['indexes']['seconds']
+        }
+
+        # Leave the file in the default rollback-journal mode for readers
+        conn.execute('PRAGMA journal_mode = DELETE')
+    except Exception:
+        conn.close()
+        os.remove(tmp_path)
+        raise
+    conn.close()
+
+    os.replace(tmp_path, db_path)
+    return stats
+
+def append_techgear_data(db_path=DB_PATH, raw_dir=RAW_DATA_DIR, batch_size=LOAD_BATCH_ROWS):
+    """Append the transactions dated after the database's last order date
+
+    For datasets extended with generate_techgear_data.py --continue. Products
+    and customers are replaced from raw_dir (the generator rewrites them with
+    updated totals), the new transactions are inserted under the existing
+    indexes, and refresh_rollups folds just those rows into the rollups and
+    customer sketches using the stored rowid watermark. Everything runs in
+    one transaction. Returns the same stats layout as load_techgear_database,
+    without 'indexes'.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"No database at {db_path}; run a full load first")
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    stats = {}
+    try:
+        last_date = conn.execute("SELECT MAX(order_date) FROM techgear_transactions").fetchone()[0]
+        start_date = None
+        if last_date is not None:
+            start_date = (date.fromisoformat(last_date) + timedelta(days=1)).isoformat()
+
+        conn.execute('BEGIN IMMEDIATE')
+        for table in TABLE_SCHEMAS:
+            start = time.perf_counter()
+            if table not in PARTITION_COLUMNS:
+                conn.execute(f"DELETE FROM {table}")
+            rows = load_table(conn, table, raw_dir, batch_size, start_date)
+            seconds = time.perf_counter() - start
+            stats[table] = {'rows': rows, 'seconds': seconds, 'rows_per_sec': rows / seconds if seconds else 0.0}
+
+        start = time.perf_counter()
+        precision = sketch_precision(conn) or DEFAULT_PRECISION
+        if refresh_rollups(conn, hll_precision=precision) == 0:
+            # No new transactions, but products and customers were replaced
+            bump_data_generation(conn)
+        stats['rollups'] = {'seconds': time.perf_counter() - start}
+        conn.execute('COMMIT')
+        stats['load'] = {'seconds': sum(stats[table]['seconds'] for table in TABLE_SCHEMAS)}
+        stats['start_date'] = start_date
+
+        conn.execute('PRAGMA optimize')
+    except Exception:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+    return stats
+
+def main():
+    """Load the TechGear Plus CSV files into a local SQLite database"""
+    parser = argparse.ArgumentParser(description="Bulk-load the TechGear Plus dataset into SQLite")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite database file to create")
+    parser.add_argument('--raw-dir', default=RAW_DATA_DIR, help="directory with the generated data files")
+    parser.add_argument('--batch-size', type=int, default=LOAD_BATCH_ROWS, help="rows per executemany batch")
+    parser.add_argument('--start-date', help="first order date to load (YYYY-MM-DD)")
+    parser.add_argument('--end-date', help="last order date to load (YYYY-MM-DD)")
+    parser.add_argument('--hll-precision', type=int, default=DEFAULT_PRECISION,
+                        help="HyperLogLog precision of the customer sketches (registers = 2**p)")
+    parser.add_argument('--append', action='store_true',
+                        help="add transactions newer than the database instead of rebuilding it")
+    args = parser.parse_args()
+    if args.append and (args.start_date or args.end_date):
+        parser.error("--append picks its own start date; drop --start-date/--end-date")
+
+    start = time.perf_counter()
+    if args.append:
+        print("Appending new TechGear Plus data to SQLite...")
+        print("=" * 50)
+        stats = append_techgear_data(args.db, args.raw_dir, args.batch_size)
+        print(f"  Transactions from: {stats['start_date'] or 'the beginning'}")
+        for table in TABLE_SCHEMAS:
+            table_stats = stats[table]
+            print(f"  {table}: {table_stats['rows']:,} rows in {table_stats['seconds']:.2f}s "
+                  f"({table_stats['rows_per_sec']:,.0f} rows/sec)")
+        print(f"  Rollup + customer sketch refresh: {stats['rollups']['seconds']:.2f}s")
+        print(f"\n✓ Database updated at {args.db} ({time.perf_counter() - start:.2f}s total)")
+        return
+
+    print("Loading TechGear Plus data into SQLite...")
+    print("=" * 50)
+
+    stats = load_techgear_database(args.db, args.raw_dir, args.batch_size, args.start_date, args.end_date,
+                                   args.hll_precision)
+
+    for table in TABLE_SCHEMAS:
+        table_stats = stats[table]
+        print(f"  {table}: {table_stats['rows']:,} rows in {table_stats['seconds']:.2f}s "
+              f"({table_stats['rows_per_sec']:,.0f} rows/sec)")
+    print(f"  Indexes + ANALYZE: {stats['indexes']['seconds']:.2f}s")
+    transactions = stats['techgear_transactions']['rows']
+    print(f"  Load: {stats['load']['seconds']:.2f}s "
+          f"({transactions / stats['load']['seconds'] if stats['load']['seconds'] else 0:,.0f} transactions/sec)")
+    print(f"  Rollups + customer sketches: {stats['rollups']['seconds']:.2f}s")
+    print(f"\n✓ Database ready at {args.db} ({time.perf_counter() - start:.2f}s total)")
+
+if __name__ == "__main__":
+    main()
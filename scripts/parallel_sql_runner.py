@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+
+from sql_statements import SQL_DIR, read_sql_statements, sql_file_path
+from db_meta import data_version
+from query_cache import DB_PATH, statement_hash
+from hll import register_sqlite_functions
+
+# Independent SELECT files that make up a dashboard refresh
+DASHBOARD_SQL_FILES = ['kpi_calculations', 'product_performance', 'customer_analysis']
+
+DEFAULT_WORKERS = 4
+DASHBOARD_OUTPUT = '../data/processed/dashboard.json'
+
+# Per-connection read settings. Memory-mapped I/O lets every connection read
+# pages straight from the OS page cache instead of keeping a private copy.
+READ_PRAGMAS = [
+    'PRAGMA query_only = ON',
+    'PRAGMA mmap_size = 1073741824',  # 1 GB
+    'PRAGMA cache_size = -65536',  # 64 MB per connection
+    'PRAGMA temp_store = MEMORY'
+]
+
+class ConnectionPool:
+    """Fixed-size pool of read-only SQLite connections shared across threads
+
+    shared_cache opens the connections on SQLite's shared page cache. That
+    saves memory for many connections, but shared-cache readers serialize on
+    the cache's locks, so private caches (the default) run queries in parallel.
+    The loader replaces the database file on a full reload, so each checkout
+    compares the file's identity with the one the connection was opened on
+    and reopens the connection when the file has changed.
+    """
+
+    def __init__(self, db_path=DB_PATH, size=DEFAULT_WORKERS, shared_cache=False):
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Database not found: {db_path} (run load_sqlite.py first)")
+        self.db_path = db_path
+        self.size = size
+        self.uri = f'file:{db_path}?mode=ro' + ('&cache=shared' if shared_cache else '')
+        self._idle = queue.Queue()
+        file_id = self._file_id()
+        for _ in range(size):
+            self._idle.put((self._open(), file_id))
+
+    def _file_id(self):
+        stat = os.stat(self.db_path)
+        return stat.st_ino, stat.st_dev
+
+    def _open(self):
+        conn = sqlite3.connect(self.uri, uri=True, check_same_thread=False)
+        for pragma in READ_PRAGMAS:
+            conn.execute(pragma)
+        return register_sqlite_functions(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        conn, file_id = self._idle.get()
+        try:
+            current_id = self._file_id()
+            if current_id != file_id:
+                conn.close()
+                conn, file_id = self._open(), current_id
+        except BaseException:
+            self._idle.put((conn, file_id))
+            raise
+        try:
+            yield conn
+        finally:
+            self._idle.put((conn, file_id))
+
+    def close(self):
+        for _ in range(self.size):
+            self._idle.get()[0].close()
+
+def load_statements(files=DASHBOARD_SQL_FILES, sql_dir=SQL_DIR):
+    """[(file, name, sql)] for every statement in the given .sql files"""
+    return [
+        (file_name, statement['name'], statement['sql'])
+        for file_name in files
+        for statement in read_sql_statements(sql_file_path(file_name, sql_dir))
+    ]
+
+def run_statement(pool, sql, cache=None, params=None):
+    """Execute one statement on a pooled connection
+
+    Returns {'columns', 'rows', 'elapsed_ms', 'cached'}; with a QueryCache,
+    results are reused until the database's data version changes.
+    """
+    start = time.perf_counter()
+    with pool.connection() as conn:
+        key = (statement_hash(sql, params), data_version(conn)) if cache is not None else None
+        result = cache.get(key) if cache is not None else None
+        cached = result is not None
+        if not cached:
+            cursor = conn.execute(sql, params or ())
+            result = {
+                'columns': [column[0] for column in cursor.description],
+                'rows': cursor.fetchall()
+            }
+            if cache is not None:
+                cache.put(key, result)
+    return dict(result, elapsed_ms=(time.perf_counter() - start) * 1000, cached=cached)
+
+def run_dashboard(pool, statements, cache=None):
+    """Run independent statements concurrently and collect one dashboard payload
+
+    Statements are dispatched to a thread per pooled connection; sqlite3
+    releases the GIL while a query runs, so the refresh takes roughly as long
+    as the slowest statement rather than the sum of all of them.
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        futures = [
+            (file_name, name, executor.submit(run_statement, pool, sql, cache))
+            for file_name, name, sql in statements
+        ]
+        files = {}
+        for file_name, name, future in futures:
+            result = future.result()
+            files.setdefault(file_name, []).append({'name': name, **result})
+
+    with pool.connection() as conn:
+        version = data_version(conn)
+
+    timings = [entry['elapsed_ms'] for entries in files.values() for entry in entries]
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'data_version': {'load_id': version[0], 'data_generation': version[1], 'max_rowid': version[2]},
+        'statements': len(timings),
+        'wall_ms': (time.perf_counter() - start) * 1000,
+        'sum_ms': sum(timings),
+        'slowest_ms': max(timings) if timings else 0.0,
+        'files': files
+    }
+
+def write_payload(payload, output_path=DASHBOARD_OUTPUT):
+    """Write the dashboard payload as JSON"""
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w') as payload_file:
+        json.dump(payload, payload_file, indent=2, default=str)
+    os.replace(tmp_path, output_path)
+
+def main():
+    """Refresh the dashboard by running its SQL files in parallel"""
+    parser = argparse.ArgumentParser(description="Run the TechGear Plus dashboard SQL in parallel")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite database file")
+    parser.add_argument('--files', nargs='+', default=DASHBOARD_SQL_FILES, help=".sql files to run")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="pooled connections / threads")
+    parser.add_argument('--shared-cache', action='store_true', help="open connections on a shared page cache")
+    parser.add_argument('--output', default=DASHBOARD_OUTPUT, help="dashboard JSON payload path")
+    args = parser.parse_args()
+
+    print("Refreshing TechGear Plus dashboard...")
+    print("=" * 50)
+
+    pool = ConnectionPool(args.db, args.workers, args.shared_cache)
+    try:
+        payload = run_dashboard(pool, load_statements(args.files))
+    finally:
+        pool.close()
+    write_payload(payload, args.output)
+
+    for file_name, entries in payload['files'].items():
+        print(f"\n{file_name}.sql:")
+        for entry in sorted(entries, key=lambda e: -e['elapsed_ms']):
+            print(f"  {entry['elapsed_ms']:8.1f} ms  {len(entry['rows']):>5} rows  {entry['name']}")
+
+    print(f"\n✓ {payload['statements']} statements in {payload['wall_ms'] / 1000:.2f}s wall "
+          f"(sum {payload['sum_ms'] / 1000:.2f}s, slowest {payload['slowest_ms'] / 1000:.2f}s)")
+    print(f"  Payload written to {args.output}")
+
+if __name__ == "__main__":
+    main()
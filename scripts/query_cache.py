@@ -0,0 +1,159 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from sql_statements import SQL_DIR, read_sql_statements, sql_file_path
+from db_meta import data_version
+from hll import register_sqlite_functions
+
+DB_PATH = '../data/techgear.db'
+
+# Statement files served to the dashboard
+DASHBOARD_SQL_FILES = ['kpi_calculations', 'product_performance', 'customer_analysis', 'kpi_rollup', 'kpi_sketches']
+
+DEFAULT_CACHE_ENTRIES = 256
+
+class QueryCache:
+    """Size-bounded LRU cache of query results with hit/miss counters"""
+
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries if full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+def statement_hash(sql, params=None):
+    """Stable hash of a statement's text and parameters"""
+    digest = hashlib.sha256(sql.encode('utf-8'))
+    if params:
+        digest.update(repr(sorted(params.items()) if isinstance(params, dict) else tuple(params)).encode('utf-8'))
+    return digest.hexdigest()
+
+def load_dashboard_statements(sql_dir=SQL_DIR, files=DASHBOARD_SQL_FILES):
+    """Named statements from the dashboard .sql files, keyed by (file, name)"""
+    statements = OrderedDict()
+    for file_name in files:
+        for statement in read_sql_statements(sql_file_path(file_name, sql_dir)):
+            statements[(file_name, statement['name'])] = statement['sql']
+    return statements
+
+class QueryRunner:
+    """Run named dashboard statements against SQLite through a versioned cache
+
+    Results are cached under (statement hash, data version). The version
+    combines the loader's load_id, the data_generation counter bumped by every
+    writer and the transaction table's max rowid, so any reload or append
+    makes older entries unreachable; they age out through LRU eviction.
+    """
+
+    def __init__(self, db_path=DB_PATH, sql_dir=SQL_DIR, cache=None):
+        self.db_path = db_path
+        self.statements = load_dashboard_statements(sql_dir)
+        self.cache = cache if cache is not None else QueryCache()
+        self._conn = None
+        self._file_id = None
+
+    def _connection(self):
+        """Read-only connection, reopened when the loader replaces the file"""
+        stat = os.stat(self.db_path)
+        file_id = (stat.st_ino, stat.st_dev)
+        if self._conn is None or file_id != self._file_id:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True, check_same_thread=False)
+            register_sqlite_functions(self._conn)
+            self._file_id = file_id
+        return self._conn
+
+    def execute(self, sql, params=None):
+        """Run a statement, serving it from the cache when the data is unchanged"""
+        conn = self._connection()
+        key = (statement_hash(sql, params), data_version(conn))
+        result = self.cache.get(key)
+        if result is None:
+            cursor = conn.execute(sql, params or ())
+            result = {
+                'columns': [column[0] for column in cursor.description],
+                'rows': cursor.fetchall()
+            }
+            self.cache.put(key, result)
+        return result
+
+    def run(self, file_name, statement_name, params=None):
+        """Run one named statement from a dashboard .sql file"""
+        return self.execute(self.statements[(file_name, statement_name)], params)
+
+    def run_all(self, files=None):
+        """Run every named statement, returning {(file, name): result}"""
+        return OrderedDict(
+            (key, self.execute(sql)) for key, sql in self.statements.items()
+            if files is None or key[0] in files
+        )
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+def main():
+    """Run the dashboard statements twice and report cache effectiveness"""
+    parser = argparse.ArgumentParser(description="Cached runner for the TechGear Plus dashboard SQL")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite database file")
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_CACHE_ENTRIES, help="cache size bound")
+    args = parser.parse_args()
+
+    runner = QueryRunner(args.db, cache=QueryCache(args.max_entries))
+    for attempt in ('cold', 'warm'):
+        start = time.perf_counter()
+        results = runner.run_all()
+        print(f"{attempt}: {len(results)} statements in {time.perf_counter() - start:.3f}s")
+
+    stats = runner.cache.stats()
+    print(f"Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions "
+          f"({stats['hit_rate']:.0%} hit rate)")
+    runner.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+import argparse
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from sql_statements import SQL_DIR, read_sql_statements, sql_file_path
+from db_meta import bump_data_generation
+from hll import DEFAULT_PRECISION, SPARSE, DENSE, RANK_BITS, register_sqlite_functions, register_updates
+from techgear_io import parse_ids
+from techgear_model import money_cents
+
+DB_PATH = '../data/techgear.db'
+ROLLUP_NAME = 'techgear_daily_rollup'
+SKETCH_TABLE = 'techgear_daily_customer_sketches'
+
+# Rollup dimensions besides order_date; sketch cells leave out customer_type
+ROLLUP_DIMENSIONS = ['product_category', 'sales_channel', 'region', 'customer_type']
+SKETCH_DIMENSIONS = ROLLUP_DIMENSIONS[:3]
+ROLLUP_MEASURES = ['orders', 'revenue_cents', 'units', 'discount_cents', 'shipping_cents']
+
+# Cell keys pack the day number and one byte per dimension code into an
+# integer; sketch keys add the register index and rank below the cell
+_DIMENSION_BITS = 8
+_INDEX_BITS = 18
+
+def rollup_statements(sql_dir=SQL_DIR):
+    """Split rollup_tables.sql into its DDL and the incremental fold statements"""
+    statements = read_sql_statements(sql_file_path('rollup_tables', sql_dir))
+    ddl = [s['sql'] for s in statements if s['sql'].upper().startswith('CREATE')]
+    fold = [s['sql'] for s in statements if s['sql'].upper().startswith('INSERT')]
+    return ddl, fold
+
+def sketch_precision(conn):
+    """Precision of the stored customer sketches, or None if there are none"""
+    row = conn.execute(f"SELECT customers_hll FROM {SKETCH_TABLE} LIMIT 1").fetchone()
+    return row[0][0] if row else None
+
+def init_rollup_build(precision=DEFAULT_PRECISION):
+    """Accumulators for building the rollups from the transaction chunks of a full load"""
+    return {
+        'precision': precision,
+        # dimension -> [labels], {label: code}
+        'labels': {dimension: ([], {}) for dimension in ROLLUP_DIMENSIONS},
+        'rollup_parts': [],
+        'sketch_parts': [],
+        'rows': 0
+    }
+
+def _dimension_codes(build, dimension, values):
+    """Stable small-integer codes for a dimension column across chunks"""
+    labels, codes = build['labels'][dimension]
+    values = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype('category')
+    lookup = []
+    for label in values.cat.categories:
+        if label not in codes:
+            if len(labels) == 1 << _DIMENSION_BITS:
+                raise ValueError(f"Too many distinct {dimension} values for the rollup build")
+            codes[label] = len(labels)
+            labels.append(label)
+        lookup.append(codes[label])
+    return np.asarray(lookup, dtype=np.int64)[values.cat.codes.to_numpy()]
+
+def _cell_keys(days, codes):
+    """Pack day numbers and dimension codes into one integer key per row"""
+    keys = days.astype(np.int64)
+    for dimension_codes in codes:
+        keys = (keys << _DIMENSION_BITS) | dimension_codes
+    return keys
+
+def _sum_by_key(keys, values):
+    """Distinct keys and the column sums of values (2-D, one row per key) per key"""
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    return keys[starts], np.add.reduceat(values[order], starts, axis=0)
+
+def _max_rank_by_key(packed):
+    """Keep the highest rank per key from values packed as key << RANK_BITS | rank"""
+    packed = np.sort(packed)
+    keys = packed >> np.uint64(RANK_BITS)
+    last = np.concatenate((keys[1:] != keys[:-1], [True]))
+    return packed[last]
+
+def accumulate_rollup_build(build, chunk):
+    """Fold one chunk of transactions (schema columns) into the rollup build"""
+    if len(chunk) == 0:
+        return
+    days = chunk['order_date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    codes = [_dimension_codes(build, dimension, chunk[dimension]) for dimension in ROLLUP_DIMENSIONS]
+
+    measures = np.column_stack([
+        np.ones(len(chunk), dtype=np.int64),
+        money_cents(chunk['total_amount']),
+        chunk['quantity'].to_numpy().astype(np.int64),
+        money_cents(chunk['discount_amount']),
+        money_cents(chunk['shipping_cost'])
+    ])
+    build['rollup_parts'].append(_sum_by_key(_cell_keys(days, codes), measures))
+
+    index, rank = register_updates(parse_ids(chunk['customer_id'], 'customer_id'), build['precision'])
+    cells = _cell_keys(days, codes[:len(SKETCH_DIMENSIONS)]).astype(np.uint64)
+    packed = (((cells << np.uint64(_INDEX_BITS)) | index.astype(np.uint64)) << np.uint64(RANK_BITS)) | rank
+    build['sketch_parts'].append(_max_rank_by_key(packed))
+    build['rows'] += len(chunk)
+
+def _cell_columns(build, keys, dimensions):
+    """Unpack cell keys into order_date text and dimension label columns"""
+    columns = []
+    for dimension in reversed(dimensions):
+        labels = np.asarray(build['labels'][dimension][0], dtype=object)
+        columns.append(labels[keys & ((1 << _DIMENSION_BITS) - 1)].tolist())
+        keys = keys >> _DIMENSION_BITS
+    columns.append(keys.astype('datetime64[D]').astype(str).tolist())
+    return columns[::-1]
+
+def _sketch_blobs(build, packed):
+    """Serialized sketch per cell, in the encoding hll_sketch produces"""
+    precision = build['precision']
+    header = {SPARSE: bytes([precision, SPARSE]), DENSE: bytes([precision, DENSE])}
+    registers = packed >> np.uint64(RANK_BITS)
+    cells = (registers >> np.uint64(_INDEX_BITS)).astype(np.int64)
+    pairs = (((registers & np.uint64((1 << _INDEX_BITS) - 1)) << np.uint64(RANK_BITS)) |
+             (packed & np.uint64((1 << RANK_BITS) - 1))).astype('<u4')
+    pair_bytes = pairs.tobytes()
+    bounds = np.flatnonzero(np.concatenate(([True], cells[1:] != cells[:-1], [True])))
+
+    blobs = []
+    for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        if 4 * (end - start) < 2 ** precision:
+            blobs.append(header[SPARSE] + pair_bytes[4 * start:4 * end])
+        else:
+            dense = np.zeros(2 ** precision, dtype=np.uint8)
+            dense[pairs[start:end] >> RANK_BITS] = pairs[start:end] & ((1 << RANK_BITS) - 1)
+            blobs.append(header[DENSE] + dense.tobytes())
+    return cells[bounds[:-1]], blobs
+
+def write_rollup_build(conn, build, sql_dir=SQL_DIR):
+    """Replace the rollup tables with a completed build and set the watermark
+
+    Meant for a freshly loaded transaction table: the watermark becomes its
+    highest rowid, so later refresh_rollups calls fold in only appended rows.
+    Returns the number of rollup rows written.
+    """
+    ddl, _ = rollup_statements(sql_dir)
+    for statement in ddl:
+        conn.execute(statement)
+    conn.execute(f"DELETE FROM {ROLLUP_NAME}")
+    conn.execute(f"DELETE FROM {SKETCH_TABLE}")
+
+    cells = 0
+    if build['rollup_parts']:
+        keys, sums = _sum_by_key(
+            np.concatenate([keys for keys, _ in build['rollup_parts']]),
+            np.concatenate([sums for _, sums in build['rollup_parts']])
+        )
+        rows = zip(*_cell_columns(build, keys, ROLLUP_DIMENSIONS), *sums.T.tolist())
+        conn.executemany(
+            f"INSERT INTO {ROLLUP_NAME} (order_date, {', '.join(ROLLUP_DIMENSIONS)}, {', '.join(ROLLUP_MEASURES)}) "
+            f"VALUES ({', '.join('?' for _ in range(1 + len(ROLLUP_DIMENSIONS) + len(ROLLUP_MEASURES)))})",
+            rows
+        )
+        cells = len(keys)
+
+        sketch_cells, blobs = _sketch_blobs(build, _max_rank_by_key(np.concatenate(build['sketch_parts'])))
+        conn.executemany(
+            f"INSERT INTO {SKETCH_TABLE} (order_date, {', '.join(SKETCH_DIMENSIONS)}, customers_hll) "
+            f"VALUES (?, ?, ?, ?, ?)",
+            zip(*_cell_columns(build, sketch_cells, SKETCH_DIMENSIONS), blobs)
+        )
+
+    high_water = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM techgear_transactions").fetchone()[0]
+    conn.execute(
+        "INSERT INTO techgear_rollup_state (rollup_name, last_rowid) VALUES (?, ?) "
+        "ON CONFLICT (rollup_name) DO UPDATE SET last_rowid = excluded.last_rowid",
+        (ROLLUP_NAME, high_water)
+    )
+    return cells
+
+def refresh_rollups(conn, sql_dir=SQL_DIR, hll_precision=DEFAULT_PRECISION):
+    """Fold transactions added since the last refresh into the daily rollups
+
+    The watermark is the highest techgear_transactions rowid already folded
+    in, so each refresh only aggregates the new rows; their customers are
+    merged into the existing HyperLogLog sketches. Returns the number of
+    transactions folded.
+    """
+    register_sqlite_functions(conn)
+    ddl, fold_sql = rollup_statements(sql_dir)
+    for statement in ddl:
+        conn.execute(statement)
+
+    row = conn.execute(
+        "SELECT last_rowid FROM techgear_rollup_state WHERE rollup_name = ?", (ROLLUP_NAME,)
+    ).fetchone()
+    watermark = row[0] if row else 0
+    high_water = conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM techgear_transactions").fetchone()[0]
+
+    if high_water < watermark:
+        # The transaction table was rebuilt underneath us - start over
+        conn.execute(f"DELETE FROM {ROLLUP_NAME}")
+        conn.execute(f"DELETE FROM {SKETCH_TABLE}")
+        watermark = 0
+
+    if high_water == watermark:
+        return 0
+
+    stored_precision = sketch_precision(conn)
+    if stored_precision not in (None, hll_precision):
+        raise ValueError(f"{SKETCH_TABLE} holds precision {stored_precision} sketches; "
+                         f"reload the database to switch to precision {hll_precision}")
+
+    folded = conn.execute(
+        "SELECT COUNT(*) FROM techgear_transactions WHERE rowid > ? AND rowid <= ?", (watermark, high_water)
+    ).fetchone()[0]
+    params = {'watermark': watermark, 'high_water': high_water, 'hll_precision': hll_precision}
+    for statement in fold_sql:
+        conn.execute(statement, params)
+    conn.execute(
+        "INSERT INTO techgear_rollup_state (rollup_name, last_rowid) VALUES (?, ?) "
+        "ON CONFLICT (rollup_name) DO UPDATE SET last_rowid = excluded.last_rowid",
+        (ROLLUP_NAME, high_water)
+    )
+    bump_data_generation(conn)
+    return folded
+
+def main():
+    """Bring the KPI rollup tables up to date"""
+    parser = argparse.ArgumentParser(description="Incrementally refresh the TechGear Plus KPI rollups")
+    parser.add_argument('--db', default=DB_PATH, help="SQLite database file")
+    parser.add_argument('--hll-precision', type=int, default=DEFAULT_PRECISION,
+                        help="HyperLogLog precision of the customer sketches (registers = 2**p)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with sqlite3.connect(args.db) as conn:
+        folded = refresh_rollups(conn, hll_precision=args.hll_precision)
+        cells = conn.execute(f"SELECT COUNT(*) FROM {ROLLUP_NAME}").fetchone()[0]
+
+    print(f"✓ Folded {folded:,} new transactions into {ROLLUP_NAME} "
+          f"({cells:,} rollup rows, {time.perf_counter() - start:.2f}s)")
+
+if __name__ == "__main__":
+    main()
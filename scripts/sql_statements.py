@@ -0,0 +1,57 @@
+import os
+import re
+import sqlite3
+
+SQL_DIR = '../sql'
+
+# Comment lines that only draw section dividers, e.g. "-- ======"
+DIVIDER_PATTERN = re.compile(r'^--\s*[=\-]*\s*$')
+
+def read_sql_statements(path):
+    """Split a .sql file into named statements
+
+    Each statement is named after the last comment line above it (section
+    banners are skipped), e.g. "Top 10 products by revenue". Returns a list of
+    {'name', 'sql'} dicts in file order; names are made unique per file.
+    """
+    with open(path) as sql_file:
+        lines = sql_file.read().splitlines()
+
+    statements = []
+    pending_name = None
+    buffer = []
+
+    for line in lines:
+        stripped = line.strip()
+        if not buffer:
+            if not stripped:
+                continue
+            if stripped.startswith('--'):
+                if not DIVIDER_PATTERN.match(stripped):
+                    pending_name = stripped.lstrip('-').strip()
+                continue
+
+        buffer.append(line)
+        sql = '\n'.join(buffer)
+        if sqlite3.complete_statement(sql):
+            statements.append({'name': pending_name or f'statement_{len(statements) + 1}', 'sql': sql.strip()})
+            pending_name = None
+            buffer = []
+
+    if buffer and '\n'.join(buffer).strip():
+        # Files may omit the trailing semicolon on their last statement
+        statements.append({'name': pending_name or f'statement_{len(statements) + 1}',
+                           'sql': '\n'.join(buffer).strip() + ';'})
+
+    seen = {}
+    for statement in statements:
+        count = seen.get(statement['name'], 0)
+        seen[statement['name']] = count + 1
+        if count:
+            statement['name'] = f"{statement['name']} ({count + 1})"
+
+    return statements
+
+def sql_file_path(name, sql_dir=SQL_DIR):
+    """Path of a .sql file in the project's sql folder"""
+    return os.path.join(sql_dir, name if name.endswith('.sql') else f'{name}.sql')
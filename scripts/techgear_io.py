@@ -0,0 +1,474 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Shared table storage for the TechGear Plus scripts.
+#
+# Every table can be stored as CSV (for SQLite Online / Tableau uploads) and as
+# a columnar bundle: a directory with one raw little-endian binary file per
+# column plus a manifest.json describing dtypes, dictionaries and row count.
+# Columns are memory-mapped on load, so reading a bundle skips all string
+# parsing. Readers prefer the bundle whenever it is at least as new as the CSV.
+#
+# Transactions can additionally be partitioned by order month: one columnar
+# bundle per month under techgear_transactions.partitions/, plus a
+# partitions.json with each partition's row count and min/max date. Readers
+# given a date range open only the partitions that overlap it.
+
+RAW_DATA_DIR = '../data/raw'
+COLUMNAR_SUFFIX = '.columns'
+PARTITION_SUFFIX = '.partitions'
+MANIFEST_FILE = 'manifest.json'
+PARTITION_MANIFEST_FILE = 'partitions.json'
+DEFAULT_CHUNK_ROWS = 500000
+
+# Generator state saved next to the data files (see generate_techgear_data.py)
+STATE_FILE = 'generator_state.json'
+
+# Tables that can be partitioned, and the date column they are split on
+PARTITION_COLUMNS = {
+    'techgear_transactions': 'order_date'
+}
+
+# String IDs are stored as their numeric part and re-formatted on load
+ID_FORMATS = {
+    'transaction_id': ('T', 7),
+    'customer_id': ('C', 6),
+    'product_id': ('P', 5)
+}
+
+# Column kinds: 'id' (numeric part of a prefixed ID), 'category' (dictionary
+# encoded string), 'date' (native datetime64, NaT for missing) or a numpy dtype
+TABLE_SCHEMAS = {
+    'techgear_products': {
+        'product_id': 'id',
+        'product_name': 'category',
+        'category': 'category',
+        'retail_price': 'float64',
+        'cost_price': 'float64',
+        'launch_date': 'date',
+        'supplier': 'category'
+    },
+    'techgear_customers': {
+        'customer_id': 'id',
+        'registration_date': 'date',
+        'customer_segment': 'category',
+        'acquisition_channel': 'category',
+        'total_orders': 'int32',
+        'total_spent': 'float64',
+        'last_order_date': 'date'
+    },
+    'techgear_transactions': {
+        'transaction_id': 'id',
+        'customer_id': 'id',
+        'order_date': 'date',
+        'product_category': 'category',
+        'product_name': 'category',
+        'product_id': 'id',
+        'quantity': 'int16',
+        'unit_price': 'float64',
+        'total_amount': 'float64',
+        'discount_amount': 'float64',
+        'shipping_cost': 'float64',
+        'sales_channel': 'category',
+        'region': 'category',
+        'customer_type': 'category'
+    }
+}
+
+# On-disk dtype for each non-numeric column kind
+KIND_DTYPES = {
+    'id': '<i4',
+    'category': '<i2',
+    'date': '<M8[s]'
+}
+
+DATE_COLUMNS = {
+    table: [column for column, kind in schema.items() if kind == 'date']
+    for table, schema in TABLE_SCHEMAS.items()
+}
+
+CATEGORY_COLUMNS = {
+    table: [column for column, kind in schema.items() if kind == 'category']
+    for table, schema in TABLE_SCHEMAS.items()
+}
+
+def storage_dtype(kind):
+    """On-disk numpy dtype string for a schema column kind"""
+    if kind in KIND_DTYPES:
+        return KIND_DTYPES[kind]
+    return np.dtype(kind).newbyteorder('<').str
+
+def csv_path(table, raw_dir=RAW_DATA_DIR):
+    """Path of a table's CSV file"""
+    return os.path.join(raw_dir, f'{table}.csv')
+
+def columnar_path(table, raw_dir=RAW_DATA_DIR):
+    """Path of a table's columnar bundle directory"""
+    return os.path.join(raw_dir, f'{table}{COLUMNAR_SUFFIX}')
+
+def partitioned_path(table, raw_dir=RAW_DATA_DIR):
+    """Path of a table's month-partitioned directory"""
+    return os.path.join(raw_dir, f'{table}{PARTITION_SUFFIX}')
+
+def read_manifest(bundle_dir):
+    """Load a columnar bundle manifest"""
+    with open(os.path.join(bundle_dir, MANIFEST_FILE)) as manifest_file:
+        return json.load(manifest_file)
+
+def _write_manifest(bundle_dir, manifest, file_name=MANIFEST_FILE):
+    """Atomically replace a columnar bundle (or partition) manifest"""
+    tmp_path = os.path.join(bundle_dir, file_name + '.tmp')
+    with open(tmp_path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(tmp_path, os.path.join(bundle_dir, file_name))
+
+def read_partition_manifest(table, raw_dir=RAW_DATA_DIR):
+    """Load the partition manifest of a partitioned table"""
+    with open(os.path.join(partitioned_path(table, raw_dir), PARTITION_MANIFEST_FILE)) as manifest_file:
+        return json.load(manifest_file)
+
+def has_columnar(table, raw_dir=RAW_DATA_DIR):
+    """True if a columnar bundle exists and is not older than the CSV"""
+    bundle_manifest = os.path.join(columnar_path(table, raw_dir), MANIFEST_FILE)
+    if not os.path.exists(bundle_manifest):
+        return False
+    table_csv = csv_path(table, raw_dir)
+    return not os.path.exists(table_csv) or os.path.getmtime(bundle_manifest) >= os.path.getmtime(table_csv)
+
+def has_partitions(table, raw_dir=RAW_DATA_DIR):
+    """True if month partitions exist and are not older than the other copies"""
+    partition_manifest = os.path.join(partitioned_path(table, raw_dir), PARTITION_MANIFEST_FILE)
+    if not os.path.exists(partition_manifest):
+        return False
+    written = os.path.getmtime(partition_manifest)
+    for other in (csv_path(table, raw_dir), os.path.join(columnar_path(table, raw_dir), MANIFEST_FILE)):
+        if os.path.exists(other) and os.path.getmtime(other) > written:
+            return False
+    return True
+
+def parse_ids(values, column):
+    """Strip the prefix from string IDs, returning their numeric part"""
+    prefix, _ = ID_FORMATS[column]
+    values = pd.Series(values, copy=False)
+    if pd.api.types.is_integer_dtype(values):
+        return values.to_numpy()
+    return values.str.slice(len(prefix)).astype(np.int64).to_numpy()
+
+def format_id_column(numbers, column):
+    """Format numeric IDs back into their prefixed string form"""
+    prefix, width = ID_FORMATS[column]
+    template = f'{prefix}%0{width}d'
+    return np.array([template % n for n in np.asarray(numbers).tolist()], dtype=object)
+
+def _encode_column(values, kind, categories):
+    """Convert a column to its on-disk array, extending categories in place"""
+    if kind == 'id':
+        return parse_ids(values, values.name).astype(KIND_DTYPES['id'])
+    if kind == 'category':
+        lookup = {value: code for code, value in enumerate(categories)}
+        is_categorical = isinstance(values.dtype, pd.CategoricalDtype)
+        uniques = values.cat.categories if is_categorical else pd.unique(values.dropna())
+        for value in uniques:
+            if value not in lookup:
+                lookup[value] = len(categories)
+                categories.append(str(value))
+        if is_categorical:
+            # Translate the Categorical's own codes through the dictionary
+            remap = np.array([lookup[value] for value in values.cat.categories] + [-1])
+            return remap[values.cat.codes.to_numpy()].astype(KIND_DTYPES['category'])
+        codes = values.map(lookup).fillna(-1).to_numpy()
+        return codes.astype(KIND_DTYPES['category'])
+    if kind == 'date':
+        return pd.to_datetime(values).to_numpy().astype(KIND_DTYPES['date'])
+    return values.to_numpy().astype(storage_dtype(kind))
+
+def write_columnar(df, table, raw_dir=RAW_DATA_DIR, append=False, categories=None, bundle_dir=None):
+    """Write (or append) a DataFrame to a table's columnar bundle
+
+    categories optionally pins the dictionary for category columns so that
+    bundles written independently share codes and can be concatenated.
+    """
+    schema = TABLE_SCHEMAS[table]
+    bundle_dir = bundle_dir or columnar_path(table, raw_dir)
+
+    if append and os.path.exists(os.path.join(bundle_dir, MANIFEST_FILE)):
+        manifest = read_manifest(bundle_dir)
+    else:
+        shutil.rmtree(bundle_dir, ignore_errors=True)
+        os.makedirs(bundle_dir)
+        manifest = {'table': table, 'rows': 0, 'columns': {}}
+        for column, kind in schema.items():
+            entry = {'kind': kind, 'dtype': storage_dtype(kind)}
+            if kind == 'category':
+                entry['categories'] = list((categories or {}).get(column, []))
+            if kind == 'id':
+                entry['prefix'], entry['width'] = ID_FORMATS[column]
+            manifest['columns'][column] = entry
+
+    for column, entry in manifest['columns'].items():
+        array = _encode_column(df[column], entry['kind'], entry.get('categories'))
+        with open(os.path.join(bundle_dir, f'{column}.bin'), 'ab') as column_file:
+            array.tofile(column_file)
+
+    manifest['rows'] += len(df)
+    _write_manifest(bundle_dir, manifest)
+
+def write_partitioned(df, table, raw_dir=RAW_DATA_DIR, append=False, categories=None):
+    """Write (or append) a DataFrame to a table's month partitions
+
+    Rows are split by the month of the table's partition column; each month
+    is appended to its own columnar bundle and the partition manifest keeps
+    per-partition row counts and min/max dates.
+    """
+    root = partitioned_path(table, raw_dir)
+    column = PARTITION_COLUMNS[table]
+
+    if append and os.path.exists(os.path.join(root, PARTITION_MANIFEST_FILE)):
+        manifest = read_partition_manifest(table, raw_dir)
+    else:
+        shutil.rmtree(root, ignore_errors=True)
+        os.makedirs(root)
+        manifest = {'table': table, 'column': column, 'granularity': 'month', 'partitions': {}}
+
+    # Group rows by month with one stable sort instead of a mask per month
+    days = pd.to_datetime(df[column]).to_numpy().astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    order = np.argsort(months, kind='stable')
+    keys, starts = np.unique(months[order], return_index=True)
+    stops = np.append(starts[1:], len(order))
+
+    for key, start, stop in zip(keys, starts, stops):
+        rows = order[start:stop]
+        name = str(key)
+        write_columnar(df.iloc[rows], table, append=True, categories=categories,
+                       bundle_dir=os.path.join(root, name + COLUMNAR_SUFFIX))
+        entry = manifest['partitions'].setdefault(name, {'rows': 0, 'min_date': None, 'max_date': None})
+        first, last = str(days[rows].min()), str(days[rows].max())
+        entry['rows'] += len(rows)
+        entry['min_date'] = first if entry['min_date'] is None else min(entry['min_date'], first)
+        entry['max_date'] = last if entry['max_date'] is None else max(entry['max_date'], last)
+
+    manifest['partitions'] = dict(sorted(manifest['partitions'].items()))
+    _write_manifest(root, manifest, PARTITION_MANIFEST_FILE)
+
+def partition_table(table, raw_dir=RAW_DATA_DIR, chunk_size=DEFAULT_CHUNK_ROWS):
+    """(Re)build a table's month partitions from its CSV or columnar copy"""
+    categories = None
+    if has_columnar(table, raw_dir):
+        bundle_columns = read_manifest(columnar_path(table, raw_dir))['columns']
+        categories = {column: entry['categories'] for column, entry in bundle_columns.items()
+                      if entry['kind'] == 'category'}
+    for chunk_number, chunk in enumerate(iter_table_chunks(table, raw_dir, chunk_size, decode_ids=False)):
+        write_partitioned(chunk, table, raw_dir, append=chunk_number > 0, categories=categories)
+
+def concat_columnar(part_dirs, table, raw_dir=RAW_DATA_DIR):
+    """Concatenate bundles written with pinned dictionaries into one bundle"""
+    bundle_dir = columnar_path(table, raw_dir)
+    shutil.rmtree(bundle_dir, ignore_errors=True)
+    os.makedirs(bundle_dir)
+
+    manifest = read_manifest(part_dirs[0])
+    manifest['rows'] = 0
+    for part_dir in part_dirs:
+        part_manifest = read_manifest(part_dir)
+        for column, entry in part_manifest['columns'].items():
+            if entry.get('categories') != manifest['columns'][column].get('categories'):
+                raise ValueError(f"Bundle parts disagree on the dictionary for {column}")
+            with open(os.path.join(part_dir, f'{column}.bin'), 'rb') as part_file, \
+                    open(os.path.join(bundle_dir, f'{column}.bin'), 'ab') as column_file:
+                shutil.copyfileobj(part_file, column_file, 16 * 1024 * 1024)
+        manifest['rows'] += part_manifest['rows']
+
+    _write_manifest(bundle_dir, manifest)
+
+def _column_array(bundle_dir, column, entry, rows):
+    """Memory-map one column of a bundle"""
+    path = os.path.join(bundle_dir, f'{column}.bin')
+    if rows == 0:
+        return np.empty(0, dtype=entry['dtype'])
+    return np.memmap(path, dtype=entry['dtype'], mode='r', shape=(rows,))
+
+def _decode_column(array, column, entry, decode_ids):
+    """Turn an on-disk array into a DataFrame column"""
+    if entry['kind'] == 'category':
+        return pd.Categorical.from_codes(array, categories=entry['categories'])
+    if entry['kind'] == 'id' and decode_ids:
+        return format_id_column(array, column)
+    return array
+
+def read_columnar(table, raw_dir=RAW_DATA_DIR, columns=None, decode_ids=True, start=0, stop=None,
+                  bundle_dir=None):
+    """Load a table (or a row slice of it) from its columnar bundle
+
+    Numeric, date and dictionary-code columns are memory-mapped rather than
+    parsed. With decode_ids=False the ID columns stay integer-valued.
+    """
+    bundle_dir = bundle_dir or columnar_path(table, raw_dir)
+    manifest = read_manifest(bundle_dir)
+    rows = manifest['rows']
+    stop = rows if stop is None else min(stop, rows)
+
+    data = {}
+    for column in columns or manifest['columns']:
+        entry = manifest['columns'][column]
+        array = _column_array(bundle_dir, column, entry, rows)[start:stop]
+        data[column] = _decode_column(array, column, entry, decode_ids)
+
+    return pd.DataFrame(data, copy=False)
+
+def _parse_id_columns(df):
+    """Replace string ID columns with their numeric part, in place"""
+    for column in df.columns.intersection(list(ID_FORMATS)):
+        df[column] = parse_ids(df[column], column)
+    return df
+
+def _csv_options(table, columns):
+    """read_csv arguments that parse dates and read category columns as Categoricals"""
+    return {
+        'usecols': columns,
+        'parse_dates': [c for c in DATE_COLUMNS[table] if columns is None or c in columns],
+        'dtype': {c: 'category' for c in CATEGORY_COLUMNS[table] if columns is None or c in columns}
+    }
+
+def read_csv_table(table, raw_dir=RAW_DATA_DIR, columns=None, decode_ids=True):
+    """Load a table from CSV with its date and category columns parsed"""
+    df = pd.read_csv(csv_path(table, raw_dir), **_csv_options(table, columns))
+    return df if decode_ids else _parse_id_columns(df)
+
+def date_bounds(start_date=None, end_date=None):
+    """Inclusive day bounds as datetime64[D] (None for an open end)"""
+    return tuple(
+        None if value is None else np.datetime64(pd.Timestamp(value).date(), 'D')
+        for value in (start_date, end_date)
+    )
+
+def select_partitions(table, raw_dir=RAW_DATA_DIR, start_date=None, end_date=None):
+    """Names and manifest entries of the partitions overlapping a date range"""
+    first, last = date_bounds(start_date, end_date)
+    selected = []
+    for name, entry in read_partition_manifest(table, raw_dir)['partitions'].items():
+        if first is not None and np.datetime64(entry['max_date']) < first:
+            continue
+        if last is not None and np.datetime64(entry['min_date']) > last:
+            continue
+        selected.append((name, entry))
+    return selected
+
+def table_date_range(table, raw_dir=RAW_DATA_DIR):
+    """First and last date of a partitionable table, as datetime64[D]"""
+    column = PARTITION_COLUMNS[table]
+    if has_partitions(table, raw_dir):
+        partitions = read_partition_manifest(table, raw_dir)['partitions'].values()
+        return (np.datetime64(min(p['min_date'] for p in partitions)),
+                np.datetime64(max(p['max_date'] for p in partitions)))
+    days = read_table(table, raw_dir, [column])[column].to_numpy().astype('datetime64[D]')
+    return days.min(), days.max()
+
+def _filter_dates(chunk, column, first, last, columns):
+    """Keep the rows of a chunk whose date falls within [first, last]"""
+    days = chunk[column].to_numpy().astype('datetime64[D]')
+    keep = np.ones(len(chunk), dtype=bool)
+    if first is not None:
+        keep &= days >= first
+    if last is not None:
+        keep &= days <= last
+    chunk = chunk if keep.all() else chunk[keep].reset_index(drop=True)
+    return chunk if columns is None else chunk[columns]
+
+def _iter_partition_chunks(table, raw_dir, chunk_size, columns, decode_ids, first, last):
+    """Yield chunks from only the partitions that overlap [first, last]"""
+    root = partitioned_path(table, raw_dir)
+    column = PARTITION_COLUMNS[table]
+    read_columns = columns if columns is None or column in columns else list(columns) + [column]
+
+    for name, entry in select_partitions(table, raw_dir, first, last):
+        # Rows need filtering only in partitions that straddle a bound
+        inside = ((first is None or np.datetime64(entry['min_date']) >= first) and
+                  (last is None or np.datetime64(entry['max_date']) <= last))
+        bundle_dir = os.path.join(root, name + COLUMNAR_SUFFIX)
+        for start in range(0, entry['rows'], chunk_size):
+            chunk = read_columnar(table, raw_dir, read_columns, decode_ids, start, start + chunk_size, bundle_dir)
+            if inside:
+                yield chunk if read_columns is columns else chunk[columns]
+            else:
+                filtered = _filter_dates(chunk, column, first, last, columns)
+                if len(filtered):
+                    yield filtered
+
+def iter_table_chunks(table, raw_dir=RAW_DATA_DIR, chunk_size=DEFAULT_CHUNK_ROWS, columns=None, decode_ids=True,
+                      start_date=None, end_date=None):
+    """Yield a table in row chunks of at most chunk_size, preferring the columnar bundle
+
+    start_date/end_date (inclusive) restrict a partitionable table to a date
+    range. Month partitions outside the range are skipped entirely; without
+    partitions every chunk is read and filtered.
+    """
+    first, last = date_bounds(start_date, end_date)
+    dated = first is not None or last is not None
+    if dated and table not in PARTITION_COLUMNS:
+        raise ValueError(f"{table} has no date column to filter on")
+
+    if dated and has_partitions(table, raw_dir):
+        yield from _iter_partition_chunks(table, raw_dir, chunk_size, columns, decode_ids, first, last)
+        return
+
+    column = PARTITION_COLUMNS.get(table)
+    read_columns = columns if not dated or columns is None or column in columns else list(columns) + [column]
+
+    if has_columnar(table, raw_dir):
+        rows = read_manifest(columnar_path(table, raw_dir))['rows']
+        chunks = (read_columnar(table, raw_dir, read_columns, decode_ids, start, start + chunk_size)
+                  for start in range(0, rows, chunk_size))
+    else:
+        chunks = (chunk if decode_ids else _parse_id_columns(chunk) for chunk in pd.read_csv(
+            csv_path(table, raw_dir), chunksize=chunk_size, **_csv_options(table, read_columns)
+        ))
+
+    for chunk in chunks:
+        if dated:
+            chunk = _filter_dates(chunk, column, first, last, columns)
+        yield chunk
+
+def concat_frames(frames, columns=None):
+    """Concatenate frames, unioning the lookup tables of category columns"""
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    data = {}
+    for column in frames[0].columns:
+        if isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            data[column] = pd.api.types.union_categoricals([frame[column].array for frame in frames])
+        else:
+            data[column] = np.concatenate([frame[column].to_numpy() for frame in frames])
+    return pd.DataFrame(data)
+
+def read_table(table, raw_dir=RAW_DATA_DIR, columns=None, decode_ids=True, start_date=None, end_date=None):
+    """Load a table, preferring the columnar bundle over CSV
+
+    With decode_ids=False ID columns hold their numeric part for either source.
+    start_date/end_date (inclusive) load only that date range, reading just
+    the overlapping month partitions when the table is partitioned.
+    """
+    if start_date is not None or end_date is not None:
+        return concat_frames(iter_table_chunks(
+            table, raw_dir, DEFAULT_CHUNK_ROWS, columns, decode_ids, start_date, end_date
+        ), columns)
+    if has_columnar(table, raw_dir):
+        return read_columnar(table, raw_dir, columns, decode_ids)
+    return read_csv_table(table, raw_dir, columns, decode_ids)
+
+def write_table(df, table, raw_dir=RAW_DATA_DIR, formats=('csv',), append=False, categories=None):
+    """Write a table in each requested format ('csv', 'columnar', 'partitioned')
+
+    'partitioned' applies only to tables in PARTITION_COLUMNS.
+    """
+    if 'csv' in formats:
+        df.to_csv(csv_path(table, raw_dir), mode='a' if append else 'w', header=not append, index=False)
+    if 'columnar' in formats:
+        write_columnar(df, table, raw_dir, append=append, categories=categories)
+    if 'partitioned' in formats and table in PARTITION_COLUMNS:
+        write_partitioned(df, table, raw_dir, append=append, categories=categories)
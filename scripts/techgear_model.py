@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+from techgear_io import TABLE_SCHEMAS, parse_ids, format_id_column, concat_frames, write_table
+
+# Compact in-memory representation of the TechGear Plus tables.
+#
+# The CSV layout keeps IDs such as "T0000001" and every categorical column as
+# Python strings. In memory the generator and validator work on:
+#   - integer surrogate keys: the numeric part of each ID, as int32
+#   - pandas Categoricals: small-int codes (int8 below 128 values) plus a
+#     lookup table of category strings
+#   - the narrowest integer type per count column, datetime64[s] for dates
+#     (pandas' coarsest datetime unit - every value is a whole day) and
+#     float32 for per-row money columns whenever every value round-trips
+#     exactly to cents
+# expand_table turns a compact frame back into the CSV layout losslessly.
+
+KEY_DTYPE = np.int32
+DATE_DTYPE = 'datetime64[s]'
+MONEY_DECIMALS = 2
+
+# Per-row money columns eligible for float32. Customer total_spent is an
+# aggregate, so it stays float64.
+MONEY_COLUMNS = {
+    'techgear_products': ['retail_price', 'cost_price'],
+    'techgear_customers': [],
+    'techgear_transactions': ['unit_price', 'total_amount', 'discount_amount', 'shipping_cost']
+}
+
+# In-memory dtypes for integer count columns
+COUNT_DTYPES = {
+    'quantity': np.int8,
+    'total_orders': np.int32
+}
+
+def money_values(values):
+    """Exact float64 dollar amounts for a (possibly float32) money column"""
+    return np.round(np.asarray(values, dtype=np.float64), MONEY_DECIMALS)
+
+def money_cents(values):
+    """Integer cents for a money column"""
+    return np.rint(np.asarray(values, dtype=np.float64) * 10 ** MONEY_DECIMALS).astype(np.int64)
+
+def compact_money(values):
+    """float32 copy of a money column if it round-trips exactly, else float64"""
+    exact = np.asarray(values, dtype=np.float64)
+    narrow = exact.astype(np.float32)
+    if np.array_equal(money_values(narrow), exact, equal_nan=True):
+        return narrow
+    return exact
+
+def category_column(values, categories=None):
+    """Categorical column; categories pins (and is extended by) the lookup table"""
+    if isinstance(values.dtype, pd.CategoricalDtype) and categories is None:
+        return values.array
+    lookup = list(categories or [])
+    known = set(lookup)
+    lookup += [value for value in pd.unique(values.dropna()) if value not in known]
+    return pd.Categorical(values, categories=lookup)
+
+def compact_table(df, table, categories=None):
+    """Convert a table (CSV layout or already compact) to the compact model
+
+    categories optionally pins the lookup tables of category columns, so
+    frames built separately share codes and concatenate cheaply.
+    """
+    money = set(MONEY_COLUMNS[table])
+    data = {}
+    for column, kind in TABLE_SCHEMAS[table].items():
+        if column not in df:
+            continue
+        values = df[column]
+        if kind == 'id':
+            data[column] = parse_ids(values, column).astype(KEY_DTYPE)
+        elif kind == 'category':
+            data[column] = category_column(values, (categories or {}).get(column))
+        elif kind == 'date':
+            data[column] = pd.to_datetime(values).to_numpy().astype(DATE_DTYPE)
+        elif column in money:
+            data[column] = compact_money(values)
+        elif column in COUNT_DTYPES:
+            data[column] = values.to_numpy().astype(COUNT_DTYPES[column])
+        else:
+            data[column] = values.to_numpy()
+    return pd.DataFrame(data, index=df.index)
+
+def restore_money(df, table):
+    """Copy of a compact frame with money columns back as exact float64"""
+    money = [column for column in MONEY_COLUMNS[table] if column in df]
+    return df.assign(**{column: money_values(df[column]) for column in money})
+
+def expand_table(df, table):
+    """Convert a compact frame back to the CSV layout (string IDs and categories)"""
+    data = {}
+    for column in df.columns:
+        kind = TABLE_SCHEMAS[table].get(column)
+        values = df[column]
+        if kind == 'id' and pd.api.types.is_integer_dtype(values):
+            data[column] = format_id_column(values.to_numpy(), column)
+        elif kind == 'category':
+            data[column] = values.to_numpy(dtype=object)
+        elif column in MONEY_COLUMNS[table]:
+            data[column] = money_values(values)
+        elif column in COUNT_DTYPES:
+            data[column] = values.to_numpy().astype(np.int64)
+        else:
+            data[column] = values
+    return pd.DataFrame(data, index=df.index)
+
+def concat_tables(frames):
+    """Concatenate compact frames, unioning category lookup tables"""
+    return concat_frames(frame for frame in frames if len(frame.columns))
+
+def write_compact_table(df, table, raw_dir, formats=('csv',), append=False, categories=None):
+    """Write a compact frame in each requested format
+
+    CSV gets the expanded string layout; columnar bundles and partitions take
+    the integer keys and category codes as they are.
+    """
+    if 'csv' in formats:
+        write_table(expand_table(df, table), table, raw_dir, ('csv',), append)
+    binary_formats = tuple(f for f in formats if f != 'csv')
+    if binary_formats:
+        write_table(restore_money(df, table), table, raw_dir, binary_formats, append, categories)
+
+def memory_bytes(df):
+    """Deep memory footprint of a frame in bytes"""
+    return int(df.memory_usage(deep=True).sum())
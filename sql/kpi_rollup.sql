@@ -0,0 +1,162 @@
+-- TechGear Plus Key Performance Indicators (rollup edition)
+-- Mirrors kpi_calculations.sql and the category queries in
+-- product_performance.sql, reading techgear_daily_rollup instead of scanning
+-- techgear_transactions. The rollup is built by scripts/load_sqlite.py and
+-- kept current by load_sqlite.py --append or scripts/refresh_rollups.py.
+-- Distinct customer counts cannot be summed across rollup rows, so those
+-- columns are left out here; kpi_sketches.sql estimates them from the daily
+-- customer sketches, and the base-table queries give exact counts.
+
+-- =====================================================
+-- EXECUTIVE SUMMARY KPIs
+-- =====================================================
+
+-- Overall business KPIs
+SELECT 
+    'Total Revenue' as metric,
+    '$' || printf('%,.2f', SUM(revenue_cents) / 100.0) as value
+FROM techgear_daily_rollup
+UNION ALL
+SELECT 
+    'Total Orders',
+    printf('%,d', SUM(orders))
+FROM techgear_daily_rollup
+UNION ALL
+SELECT 
+    'Average Order Value',
+    '$' || printf('%.2f', SUM(revenue_cents) / 100.0 / SUM(orders))
+FROM techgear_daily_rollup;
+
+-- =====================================================
+-- GROWTH ANALYSIS
+-- =====================================================
+
+-- Year-over-year growth analysis
+WITH yearly_revenue AS (
+    SELECT 
+        substr(order_date, 1, 4) as year,
+        SUM(revenue_cents) / 100.0 as revenue
+    FROM techgear_daily_rollup
+    GROUP BY substr(order_date, 1, 4)
+)
+SELECT 
+    year,
+    '$' || printf('%,.2f', revenue) as revenue,
+    CASE 
+        WHEN LAG(revenue) OVER (ORDER BY year) IS NOT NULL 
+        THEN printf('%.1f%%', 
+            ((revenue - LAG(revenue) OVER (ORDER BY year)) / 
+             LAG(revenue) OVER (ORDER BY year)) * 100
+        )
+        ELSE 'N/A'
+    END as yoy_growth
+FROM yearly_revenue
+ORDER BY year;
+
+-- Monthly revenue trends
+SELECT 
+    substr(order_date, 1, 7) as month,
+    SUM(orders) as total_orders,
+    '$' || printf('%,.2f', SUM(revenue_cents) / 100.0) as total_revenue,
+    '$' || printf('%.2f', SUM(revenue_cents) / 100.0 / SUM(orders)) as avg_order_value
+FROM techgear_daily_rollup
+GROUP BY substr(order_date, 1, 7)
+ORDER BY month;
+
+-- =====================================================
+-- SALES CHANNEL PERFORMANCE
+-- =====================================================
+
+-- Channel revenue analysis
+SELECT 
+    sales_channel,
+    SUM(orders) as total_orders,
+    '$' || printf('%,.2f', SUM(revenue_cents) / 100.0) as total_revenue,
+    ROUND(SUM(revenue_cents) * 100.0 / (SELECT SUM(revenue_cents) FROM techgear_daily_rollup), 1) || '%' as revenue_share,
+    '$' || printf('%.2f', SUM(revenue_cents) / 100.0 / SUM(orders)) as avg_order_value
+FROM techgear_daily_rollup
+GROUP BY sales_channel
+ORDER BY SUM(revenue_cents) DESC;
+
+-- =====================================================
+-- GEOGRAPHIC PERFORMANCE
+-- =====================================================
+
+-- Regional sales breakdown
+SELECT 
+    region,
+    SUM(orders) as total_orders,
+    '$' || printf('%,.2f', SUM(revenue_cents) / 100.0) as total_revenue,
+    ROUND(SUM(revenue_cents) * 100.0 / (SELECT SUM(revenue_cents) FROM techgear_daily_rollup), 1) || '%' as revenue_share,
+    '$' || printf('%.2f', SUM(revenue_cents) / 100.0 / SUM(orders)) as avg_order_value
+FROM techgear_daily_rollup
+GROUP BY region
+ORDER BY SUM(revenue_cents) DESC;
+
+-- =====================================================
+-- SEASONAL ANALYSIS
+-- =====================================================
+
+-- Seasonal trends (by month)
+SELECT 
+    substr(order_date, 6, 2) as month_num,
+    CASE substr(order_date, 6, 2)
+        WHEN '01' THEN 'January'
+        WHEN '02' THEN 'February'  
+        WHEN '03' THEN 'March'
+        WHEN '04' THEN 'April'
+        WHEN '05' THEN 'May'
+        WHEN '06' THEN 'June'
+        WHEN '07' THEN 'July'
+        WHEN '08' THEN 'August'
+        WHEN '09' THEN 'September'
+        WHEN '10' THEN 'October'
+        WHEN '11' THEN 'November'
+        WHEN '12' THEN 'December'
+    END as month_name,
+    SUM(orders) as total_orders,
+    '$' || printf('%,.2f', SUM(revenue_cents) / 100.0) as total_revenue,
+    '$' || printf('%.2f', SUM(revenue_cents) / 100.0 / SUM(orders)) as avg_order_value
+FROM techgear_daily_rollup
+GROUP BY substr(order_date, 6, 2)
+ORDER BY SUM(revenue_cents) DESC;
+
+-- =====================================================
+-- PRODUCT CATEGORY PERFORMANCE
+-- =====================================================
+
+-- Category revenue breakdown
+SELECT 
+    product_category,
+    SUM(orders) as total_orders,
+    '$' || printf('%,.2f', SUM(revenue_cents) / 100.0) as total_revenue,
+    ROUND(SUM(revenue_cents) * 100.0 / (SELECT SUM(revenue_cents) FROM techgear_daily_rollup), 1) || '%' as revenue_share,
+    '$' || printf('%.2f', SUM(revenue_cents) / 100.0 / SUM(orders)) as avg_order_value,
+    SUM(units) as units_sold
+FROM techgear_daily_rollup
+GROUP BY product_category
+ORDER BY SUM(revenue_cents) DESC;
+
+-- Monthly category performance trends
+SELECT 
+    substr(order_date, 1, 7) as month,
+    product_category,
+    SUM(orders) as orders,
+    '$' || printf('%,.2f', SUM(revenue_cents) / 100.0) as revenue,
+    '$' || printf('%.2f', SUM(revenue_cents) / 100.0 / SUM(orders)) as avg_order_value
+FROM techgear_daily_rollup
+GROUP BY substr(order_date, 1, 7), product_category
+ORDER BY month, product_category;
+
+-- =====================================================
+-- TABLEAU-READY EXECUTIVE SUMMARY
+-- =====================================================
+
+-- Complete executive summary for dashboard
+SELECT 
+    (SELECT SUM(orders) FROM techgear_daily_rollup) as total_transactions,
+    (SELECT COUNT(*) FROM techgear_products) as total_products,
+    (SELECT printf('$%,.2f', SUM(revenue_cents) / 100.0) FROM techgear_daily_rollup) as total_revenue,
+    (SELECT printf('$%.2f', SUM(revenue_cents) / 100.0 / SUM(orders)) FROM techgear_daily_rollup) as avg_order_value,
+    (SELECT MIN(order_date) FROM techgear_daily_rollup) as first_order_date,
+    (SELECT MAX(order_date) FROM techgear_daily_rollup) as last_order_date;
@@ -0,0 +1,80 @@
+-- TechGear Plus Customer Cardinality KPIs (approximate)
+-- Unique-customer counts read from the HyperLogLog sketches in
+-- techgear_daily_customer_sketches instead of COUNT(DISTINCT customer_id)
+-- over techgear_transactions. Needs the hll_* functions from scripts/hll.py
+-- (registered by query_cache.py and parallel_sql_runner.py).
+-- Estimates carry the relative standard error shown in error_margin (about
+-- 1.6% at the default precision); the exact counts in kpi_calculations.sql
+-- remain the reference for audits.
+
+-- =====================================================
+-- EXECUTIVE SUMMARY KPIs
+-- =====================================================
+
+-- Total customers (approximate)
+SELECT
+    'Total Customers' as metric,
+    printf('%,d', hll_count(hll_union(customers_hll))) as value,
+    printf('±%.1f%%', hll_error(hll_union(customers_hll)) * 100) as error_margin
+FROM techgear_daily_customer_sketches;
+
+-- =====================================================
+-- GROWTH ANALYSIS
+-- =====================================================
+
+-- Monthly unique customers
+SELECT
+    substr(order_date, 1, 7) as month,
+    hll_count(hll_union(customers_hll)) as unique_customers,
+    printf('±%.1f%%', hll_error(hll_union(customers_hll)) * 100) as error_margin
+FROM techgear_daily_customer_sketches
+GROUP BY substr(order_date, 1, 7)
+ORDER BY month;
+
+-- =====================================================
+-- SALES CHANNEL PERFORMANCE
+-- =====================================================
+
+-- Channel unique customers
+SELECT
+    sales_channel,
+    hll_count(hll_union(customers_hll)) as unique_customers,
+    printf('±%.1f%%', hll_error(hll_union(customers_hll)) * 100) as error_margin
+FROM techgear_daily_customer_sketches
+GROUP BY sales_channel
+ORDER BY unique_customers DESC;
+
+-- =====================================================
+-- GEOGRAPHIC PERFORMANCE
+-- =====================================================
+
+-- Regional unique customers
+SELECT
+    region,
+    hll_count(hll_union(customers_hll)) as unique_customers,
+    printf('±%.1f%%', hll_error(hll_union(customers_hll)) * 100) as error_margin
+FROM techgear_daily_customer_sketches
+GROUP BY region
+ORDER BY unique_customers DESC;
+
+-- =====================================================
+-- PRODUCT CATEGORY PERFORMANCE
+-- =====================================================
+
+-- Category unique customers
+SELECT
+    product_category,
+    hll_count(hll_union(customers_hll)) as unique_customers,
+    printf('±%.1f%%', hll_error(hll_union(customers_hll)) * 100) as error_margin
+FROM techgear_daily_customer_sketches
+GROUP BY product_category
+ORDER BY unique_customers DESC;
+
+-- Customers active in the last 90 days of data
+SELECT
+    hll_count(hll_union(customers_hll)) as active_customers_90d,
+    printf('±%.1f%%', hll_error(hll_union(customers_hll)) * 100) as error_margin
+FROM techgear_daily_customer_sketches
+WHERE order_date > (
+    SELECT date(MAX(order_date), '-90 days') FROM techgear_daily_customer_sketches
+);
@@ -0,0 +1,91 @@
+-- TechGear Plus Daily Rollups
+-- Pre-aggregated daily sales used by kpi_rollup.sql
+-- Built by scripts/load_sqlite.py during a full load; load_sqlite.py --append
+-- and scripts/refresh_rollups.py then fold in only the transactions added
+-- since (rowid above the stored watermark) with the statements below
+-- The customer sketch fold uses the hll_* functions from scripts/hll.py, so
+-- this file has to be run through the scripts rather than the sqlite3 shell
+
+-- =====================================================
+-- ROLLUP TABLES
+-- =====================================================
+
+-- Daily sales by category, channel, region and customer type
+-- Money is kept in integer cents so folded totals stay exact
+CREATE TABLE IF NOT EXISTS techgear_daily_rollup (
+    order_date TEXT NOT NULL,
+    product_category TEXT NOT NULL,
+    sales_channel TEXT NOT NULL,
+    region TEXT NOT NULL,
+    customer_type TEXT NOT NULL,
+    orders INTEGER NOT NULL,
+    revenue_cents INTEGER NOT NULL,
+    units INTEGER NOT NULL,
+    discount_cents INTEGER NOT NULL,
+    shipping_cents INTEGER NOT NULL,
+    PRIMARY KEY (order_date, product_category, sales_channel, region, customer_type)
+) WITHOUT ROWID;
+
+-- Approximate distinct customers per day, category, channel and region
+-- HyperLogLog sketches (scripts/hll.py) merge across rows with hll_union, so
+-- unique-customer counts can be read for any combination of cells
+CREATE TABLE IF NOT EXISTS techgear_daily_customer_sketches (
+    order_date TEXT NOT NULL,
+    product_category TEXT NOT NULL,
+    sales_channel TEXT NOT NULL,
+    region TEXT NOT NULL,
+    customers_hll BLOB NOT NULL,
+    PRIMARY KEY (order_date, product_category, sales_channel, region)
+) WITHOUT ROWID;
+
+-- Refresh watermarks (highest transaction rowid already folded in)
+CREATE TABLE IF NOT EXISTS techgear_rollup_state (
+    rollup_name TEXT PRIMARY KEY,
+    last_rowid INTEGER NOT NULL
+);
+
+-- =====================================================
+-- INCREMENTAL REFRESH
+-- =====================================================
+
+-- Fold new transactions into the daily rollup
+INSERT INTO techgear_daily_rollup (
+    order_date, product_category, sales_channel, region, customer_type,
+    orders, revenue_cents, units, discount_cents, shipping_cents
+)
+SELECT 
+    order_date,
+    product_category,
+    sales_channel,
+    region,
+    customer_type,
+    COUNT(*),
+    SUM(CAST(ROUND(total_amount * 100) AS INTEGER)),
+    SUM(quantity),
+    SUM(CAST(ROUND(discount_amount * 100) AS INTEGER)),
+    SUM(CAST(ROUND(shipping_cost * 100) AS INTEGER))
+FROM techgear_transactions
+WHERE rowid > :watermark AND rowid <= :high_water
+GROUP BY order_date, product_category, sales_channel, region, customer_type
+ON CONFLICT (order_date, product_category, sales_channel, region, customer_type) DO UPDATE SET
+    orders = orders + excluded.orders,
+    revenue_cents = revenue_cents + excluded.revenue_cents,
+    units = units + excluded.units,
+    discount_cents = discount_cents + excluded.discount_cents,
+    shipping_cents = shipping_cents + excluded.shipping_cents;
+
+-- Fold the customers of new transactions into the daily sketches
+INSERT INTO techgear_daily_customer_sketches (
+    order_date, product_category, sales_channel, region, customers_hll
+)
+SELECT 
+    order_date,
+    product_category,
+    sales_channel,
+    region,
+    hll_sketch(customer_id, :hll_precision)
+FROM techgear_transactions
+WHERE rowid > :watermark AND rowid <= :high_water
+GROUP BY order_date, product_category, sales_channel, region
+ON CONFLICT (order_date, product_category, sales_channel, region) DO UPDATE SET
+    customers_hll = hll_merge(customers_hll, excluded.customers_hll);
@@ -1,9 +1,92 @@
 -- TechGear Plus Database Schema
 -- Table structures and initial setup
+-- Loaded by scripts/load_sqlite.py: tables are created first, the CSV data is
+-- bulk-inserted, then the indexes are built and ANALYZE is run
+
+-- =====================================================
+-- TABLES
+-- =====================================================
+
+-- Customer master with lifetime metrics
+CREATE TABLE IF NOT EXISTS techgear_customers (
+    customer_id TEXT PRIMARY KEY,
+    registration_date TEXT NOT NULL,
+    customer_segment TEXT NOT NULL,
+    acquisition_channel TEXT NOT NULL,
+    total_orders INTEGER NOT NULL DEFAULT 0,
+    total_spent REAL NOT NULL DEFAULT 0,
+    last_order_date TEXT
+);
+
+-- Product catalog
+CREATE TABLE IF NOT EXISTS techgear_products (
+    product_id TEXT PRIMARY KEY,
+    product_name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    retail_price REAL NOT NULL,
+    cost_price REAL NOT NULL,
+    launch_date TEXT NOT NULL,
+    supplier TEXT
+);
+
+-- Sales transactions
+-- transaction_id is kept unique by an index built after the bulk load; the
+-- table itself is keyed by its integer rowid
+CREATE TABLE IF NOT EXISTS techgear_transactions (
+    transaction_id TEXT NOT NULL,
+    customer_id TEXT NOT NULL,
+    order_date TEXT NOT NULL,
+    product_category TEXT NOT NULL,
+    product_name TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    unit_price REAL NOT NULL,
+    total_amount REAL NOT NULL,
+    discount_amount REAL NOT NULL DEFAULT 0,
+    shipping_cost REAL NOT NULL DEFAULT 0,
+    sales_channel TEXT NOT NULL,
+    region TEXT NOT NULL,
+    customer_type TEXT NOT NULL
+);
+
+-- Load bookkeeping (load_id, data_generation) used to version cached query results
+CREATE TABLE IF NOT EXISTS techgear_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+-- =====================================================
+-- INDEXES
+-- =====================================================
+
+-- Transaction ID uniqueness and lookups
+CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_transaction_id ON techgear_transactions (transaction_id);
+
+-- Date filters and monthly/yearly grouping
+CREATE INDEX IF NOT EXISTS idx_transactions_order_date ON techgear_transactions (order_date);
+
+-- Customer lookups
+CREATE INDEX IF NOT EXISTS idx_transactions_customer_id ON techgear_transactions (customer_id);
+
+-- Product joins
+CREATE INDEX IF NOT EXISTS idx_transactions_product_id ON techgear_transactions (product_id);
+
+-- Category breakdowns
+CREATE INDEX IF NOT EXISTS idx_transactions_product_category ON techgear_transactions (product_category);
+
+-- Channel breakdowns
+CREATE INDEX IF NOT EXISTS idx_transactions_sales_channel ON techgear_transactions (sales_channel);
+
+-- Regional breakdowns
+CREATE INDEX IF NOT EXISTS idx_transactions_region ON techgear_transactions (region);
+
+-- =====================================================
+-- DATA VALIDATION
+-- =====================================================
 
 -- Data validation queries
 SELECT 'techgear_customers' as table_name, COUNT(*) as records FROM techgear_customers
 UNION ALL
 SELECT 'techgear_products', COUNT(*) FROM techgear_products  
 UNION ALL
-SELECT 'techgear_transactions', COUNT(*) FROM techgear_transactions;
\ No newline at end of file
+SELECT 'techgear_transactions', COUNT(*) FROM techgear_transactions;
@@ -0,0 +1,55 @@
+import asyncio
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+sys.path.insert(0, SCRIPTS_DIR)
+
+from generate_techgear_data import main as generate_main
+from load_sqlite import load_techgear_database
+from kpi_api import KPIService
+
+OVERALL_KPIS = '/kpi/kpi_calculations/overall-business-kpis'
+
+@pytest.fixture
+def datasets(tmp_path, monkeypatch):
+    """Two generated datasets of different sizes; the scripts run from scripts/"""
+    monkeypatch.chdir(SCRIPTS_DIR)
+    raw_dirs = {}
+    for transactions in (2000, 1000):
+        raw_dirs[transactions] = str(tmp_path / f'raw-{transactions}')
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_main(['--transactions', str(transactions), '--output-dir', raw_dirs[transactions]])
+    return raw_dirs
+
+def total_orders(payload):
+    return dict(payload['rows'])['Total Orders']
+
+def test_service_picks_up_a_full_reload(tmp_path, datasets):
+    db_path = str(tmp_path / 'techgear.db')
+    load_techgear_database(db_path, datasets[2000])
+    service = KPIService(db_path, workers=2)
+
+    async def fetch():
+        _, kpis = await service.dispatch('GET', OVERALL_KPIS)
+        _, stats = await service.dispatch('GET', '/stats')
+        return kpis, stats['data_version']
+
+    try:
+        kpis, before = asyncio.run(fetch())
+        assert total_orders(kpis) == '2,000'
+        assert before['max_rowid'] == 2000
+
+        # load_sqlite.py replaces the database file while the service is running
+        load_techgear_database(db_path, datasets[1000])
+        kpis, after = asyncio.run(fetch())
+        assert total_orders(kpis) == '1,000'
+        assert not kpis['cached']
+        assert after['max_rowid'] == 1000
+        assert after['load_id'] != before['load_id']
+    finally:
+        service.close()